@@ -1,16 +1,52 @@
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
+from src.api.dependencies.metrics import track_in_flight
+from src.api.dependencies.user import authorize
+from src.api.middleware.idempotency import (
+    IdempotencyMiddleware,
+    compile_idempotent_routes,
+)
 from src.api.handlers.user_handlers import router as user_router
 from src.api.handlers.admin_handlers import router as admin_router
 from src.api.handlers.mock_handlers import router as mock_router
+from src.api.handlers.introspection_handlers import router as introspection_router
+from src.api.handlers.health_handlers import router as health_router
+from src.auth.breached import breached_passwords
+from src.auth.hashing import password_hasher
+from src.auth.permissions import compile_route_policy
 from src.db.engine import engine
-from src.db.engine import async_run_db
+from src.db.shards import user_shards
+from src.infra.activity import activity_tracker
+from src.infra.audit import audit_log
+from src.infra.health import loop_monitor, pool_monitor
+from src.infra.idempotency import idempotency_store
+from src.infra.purge import user_purger
+from src.startup import prepare
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await async_run_db()
+    breached_passwords.load()
+    await loop_monitor.start()
+    pool_monitor.watch("main", engine)
+    for n, shard_engine in enumerate(user_shards.engines):
+        pool_monitor.watch(f"shard_{n}", shard_engine)
+    maintenance = await prepare()
+    await idempotency_store.load()
+    await audit_log.start()
+    await activity_tracker.start()
+    await user_purger.start()
     yield
+    if maintenance is not None:
+        await maintenance
+    await user_purger.stop()
+    await activity_tracker.stop()
+    await audit_log.stop()
+    await idempotency_store.stop()
+    password_hasher.close()
+    breached_passwords.close()
+    await loop_monitor.stop()
+    await user_shards.dispose()
     await engine.dispose()
 
 
@@ -21,9 +57,17 @@ def create() -> FastAPI:
         description="Тестовое задание авторизации и аутентификации",
         docs_url="/api/docs",
         lifespan=lifespan,
+        dependencies=[Depends(track_in_flight), Depends(authorize)],
     )
 
     app.include_router(prefix="/api/v1/users", router=user_router, tags=["Users"])
     app.include_router(prefix="/api/v1/users", router=admin_router, tags=["Admin"])
     app.include_router(prefix="/api/v1/mock", router=mock_router, tags=["Mock"])
+    app.include_router(
+        prefix="/api/v1/introspect", router=introspection_router, tags=["Introspection"]
+    )
+    app.include_router(prefix="/api/v1/health", router=health_router, tags=["Health"])
+    app.add_middleware(IdempotencyMiddleware)
+    app.state.route_policy = compile_route_policy(app.routes)
+    app.state.idempotent_routes = compile_idempotent_routes(app.routes)
     return app
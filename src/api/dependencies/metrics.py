@@ -0,0 +1,13 @@
+from fastapi import Request
+
+from src.infra.health import in_flight
+
+
+async def track_in_flight(request: Request):
+    """Учитывает запрос в числе выполняющихся запросов его маршрута."""
+    route = f"{request.method} {request.scope['route'].path}"
+    in_flight.enter(route)
+    try:
+        yield
+    finally:
+        in_flight.exit(route)
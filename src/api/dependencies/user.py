@@ -2,6 +2,10 @@ from typing import Annotated
 from fastapi import Depends, HTTPException, Request
 
 from src.auth.jwt import Auth
+from src.auth.permissions import permissions_for
+from src.auth.sessions import session_store
+from src.config import settings
+from src.infra.activity import activity_tracker
 
 
 async def get_token(request: Request) -> str:
@@ -15,11 +19,42 @@ async def get_token(request: Request) -> str:
     return token
 
 
-async def get_payload(token: str = Depends(get_token)):
-    """Декодирует JWT и возвращает payload."""
-    payload = Auth().decode_token(token)
+async def get_payload(request: Request, token: str = Depends(get_token)):
+    """Возвращает payload токена.
+
+    В режиме `session` токен разрешается через хранилище серверных сессий,
+    иначе декодируется как JWT. Запрос отмечается в `activity_tracker`
+    (только в памяти, без записи в БД). Payload кэшируется в `request.state`,
+    чтобы `authorize` и обработчик не проверяли токен дважды.
+    """
+    payload = getattr(request.state, "payload", None)
+    if payload is not None:
+        return payload
+    if settings.AUTH_MODE == "session":
+        payload = await session_store.resolve(token)
+    else:
+        payload = Auth().decode_token(token)
+    if "perms" not in payload:  # токены, выданные до появления claim "perms"
+        payload["perms"] = permissions_for(payload["role"])
+    activity_tracker.seen(payload["email"])
+    request.state.payload = payload
     return payload
 
 
+async def authorize(request: Request) -> None:
+    """Единая проверка прав для всех маршрутов приложения.
+
+    Требуемая маска берётся из таблицы, собранной при старте
+    (`compile_route_policy`), и сравнивается с claim "perms" токена
+    одной операцией AND, без обращения к БД.
+    """
+    required = request.app.state.route_policy.get(id(request.scope.get("route")))
+    if not required:
+        return
+    payload = await get_payload(request, await get_token(request))
+    if payload["perms"] & required != required:
+        raise HTTPException(status_code=403, detail="Недостаточно прав")
+
+
 UserTokenDep = Annotated[str, Depends(get_token)]
 PayloadDep = Annotated[dict, Depends(get_payload)]
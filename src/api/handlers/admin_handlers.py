@@ -1,14 +1,23 @@
+from datetime import datetime
 from random import choice
-from fastapi import APIRouter, Depends, HTTPException, Path, status
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from fastapi.responses import StreamingResponse
 from typing import Annotated
 from src.api.dependencies.user import get_payload
+from src.api.schemas.activity import UserActivitySchema
+from src.api.schemas.audit import AuditRecordSchema
+from src.api.schemas.pagination import Page
+from src.api.schemas.purge import PurgeStatusSchema
+from src.api.schemas.user_summary import UserSummarySchema
 from src.api.services.user import UserService
 from src.api.services.utils import JOKES, ModeDelete
 from src.api.schemas.delete import UserDeleteScheme
 from src.db.engine import get_async_session
+from src.db.model_audit import AuditAction
 from src.db.roles import UserRole
 from src.db.uow import UnitOfWork
-
+from src.infra.purge import user_purger
+from src.infra.repositories.audit import AuditRepository
 
 router = APIRouter()
 
@@ -38,11 +47,6 @@ async def change_user_role(
     role: UserRole,
 ):
     """Изменяет роль указанного пользователя (только для админа)."""
-    if payload["role"] != UserRole.ADMIN:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Недостаточно прав для изменения роли пользователя",
-        )
     try:
         async with UnitOfWork(get_async_session) as uow:
             service = UserService(uow)
@@ -57,6 +61,111 @@ async def change_user_role(
         )
 
 
+@router.get(
+    "/",
+    summary="Список пользователей (только для админа)",
+    description="Постраничный список пользователей по возрастанию email; в шардированном режиме собирается со всех шардов.",
+    response_model=Page[UserSummarySchema],
+    responses={status.HTTP_403_FORBIDDEN: {"description": "Недостаточно прав"}},
+)
+async def list_users(
+    payload: Annotated[dict, Depends(get_payload)],
+    after: Annotated[
+        str | None,
+        Query(description="Курсор: email последнего пользователя предыдущей страницы"),
+    ] = None,
+    limit: Annotated[int, Query(ge=1, le=500)] = 50,
+):
+    """Возвращает страницу пользователей (только для админа)."""
+    async with UnitOfWork(get_async_session) as uow:
+        service = UserService(uow)
+        users = await service.list_users(after=after, limit=limit)
+    items = [UserSummarySchema.model_validate(user) for user in users]
+    next_cursor = items[-1].email if len(items) == limit else None
+    return Page(items=items, next_cursor=next_cursor)
+
+
+@router.get(
+    "/export",
+    summary="Экспорт пользователей (только для админа)",
+    description="Все пользователи в формате NDJSON (по строке JSON на пользователя), по возрастанию email.",
+    response_class=StreamingResponse,
+    responses={status.HTTP_403_FORBIDDEN: {"description": "Недостаточно прав"}},
+)
+async def export_users(payload: Annotated[dict, Depends(get_payload)]):
+    """Потоково выгружает всех пользователей (только для админа)."""
+
+    async def lines():
+        async with UnitOfWork(get_async_session) as uow:
+            service = UserService(uow)
+            async for user in service.export_users():
+                yield UserSummarySchema.model_validate(user).model_dump_json() + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.get(
+    "/search",
+    summary="Поиск пользователей (только для админа)",
+    description="Полнотекстовый поиск по началу слов в имени, фамилии, отчестве и email; результаты упорядочены по релевантности.",
+    response_model=Page[UserSummarySchema],
+    responses={status.HTTP_403_FORBIDDEN: {"description": "Недостаточно прав"}},
+)
+async def search_users(
+    payload: Annotated[dict, Depends(get_payload)],
+    q: Annotated[
+        str, Query(min_length=1, max_length=100, description="Поисковый запрос")
+    ],
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    offset: Annotated[int, Query(ge=0, le=10_000)] = 0,
+):
+    """Ищет пользователей по ФИО и email (только для админа)."""
+    async with UnitOfWork(get_async_session) as uow:
+        service = UserService(uow)
+        users = await service.search_users(q, limit=limit, offset=offset)
+    items = [UserSummarySchema.model_validate(user) for user in users]
+    next_cursor = offset + limit if len(items) == limit else None
+    return Page(items=items, next_cursor=next_cursor)
+
+
+@router.get(
+    "/purge",
+    summary="Состояние очистки деактивированных пользователей (только для админа)",
+    description="Прогресс текущего прохода фоновой очистки и накопленные счётчики: удалено в архив, пачки, освобождённые страницы БД.",
+    response_model=PurgeStatusSchema,
+    responses={status.HTTP_403_FORBIDDEN: {"description": "Недостаточно прав"}},
+)
+async def get_purge_status(payload: Annotated[dict, Depends(get_payload)]):
+    """Возвращает состояние фоновой очистки (только для админа)."""
+    return PurgeStatusSchema.model_validate(user_purger.stats)
+
+
+@router.get(
+    "/{user_oid}/activity",
+    summary="Активность пользователя (только для админа)",
+    description="Время последнего входа, последнего запроса и число неудачных попыток входа.",
+    response_model=UserActivitySchema,
+    responses={
+        status.HTTP_400_BAD_REQUEST: {"description": "Пользователь не найден"},
+        status.HTTP_403_FORBIDDEN: {"description": "Недостаточно прав"},
+    },
+)
+async def get_user_activity(
+    user_oid: Annotated[str, Path(description="UUID пользователя")],
+    payload: Annotated[dict, Depends(get_payload)],
+):
+    """Возвращает активность указанного пользователя (только для админа)."""
+    try:
+        async with UnitOfWork(get_async_session) as uow:
+            service = UserService(uow)
+            return await service.get_user_activity(oid_user=user_oid)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+
 @router.delete(
     "/",
     summary="Перманентное удаление пользователя",
@@ -79,11 +188,6 @@ async def hard_delete_user(
     payload: Annotated[dict, Depends(get_payload)],
 ):
     """Полное удаление пользователя (только для админа)."""
-    if payload["role"] != UserRole.ADMIN:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Недостаточно прав для удаления пользователя",
-        )
     try:
         async with UnitOfWork(get_async_session) as uow:
             service = UserService(uow)
@@ -108,3 +212,40 @@ async def admin_joke(_: Annotated[dict, Depends(get_payload)]):
     """Возвращает случайную шутку. Доступно только администраторам."""
     joke = choice(JOKES)
     return {"message": joke}
+
+
+@router.get(
+    "/audit",
+    summary="Журнал аудита (только для админа)",
+    description="События входа, смены пароля и роли, деактивации и удаления за период, от новых к старым.",
+    response_model=Page[AuditRecordSchema],
+    responses={status.HTTP_403_FORBIDDEN: {"description": "Недостаточно прав"}},
+)
+async def get_audit_log(
+    payload: Annotated[dict, Depends(get_payload)],
+    since: Annotated[
+        datetime | None, Query(description="Начало периода (включительно)")
+    ] = None,
+    until: Annotated[
+        datetime | None, Query(description="Конец периода (не включительно)")
+    ] = None,
+    email: Annotated[str | None, Query(description="Email пользователя")] = None,
+    action: Annotated[AuditAction | None, Query(description="Тип события")] = None,
+    after: Annotated[
+        int | None, Query(ge=1, description="Курсор: next_cursor предыдущей страницы")
+    ] = None,
+    limit: Annotated[int, Query(ge=1, le=1000)] = 100,
+):
+    """Возвращает страницу журнала аудита (только для админа)."""
+    filter_by = {}
+    if email:
+        filter_by["email"] = email
+    if action:
+        filter_by["action"] = action.value
+    async with UnitOfWork(get_async_session) as uow:
+        records = await AuditRepository(session=uow.session).get_page(
+            since=since, until=until, before=after, limit=limit, **filter_by
+        )
+    items = [AuditRecordSchema.model_validate(record) for record in records]
+    next_cursor = items[-1].id if len(items) == limit else None
+    return Page(items=items, next_cursor=next_cursor)
@@ -0,0 +1,75 @@
+from typing import Annotated
+from fastapi import APIRouter, Depends, Response, status
+
+from src.api.dependencies.user import get_payload
+from src.api.schemas.health import ReadinessSchema, RuntimeStatsSchema
+from src.auth.hashing import password_hasher
+from src.infra.health import (
+    DEGRADED_CHECKS,
+    in_flight,
+    loop_monitor,
+    pool_monitor,
+    readiness,
+)
+from src.infra.repositories.compiled_user import statement_stats
+
+router = APIRouter()
+
+
+@router.get(
+    "/live",
+    summary="Проверка жизнеспособности",
+    description="Отвечает 200, пока процесс обрабатывает запросы. Не обращается к БД.",
+)
+async def liveness():
+    """Проба жизнеспособности для оркестратора."""
+    return {"status": "ok"}
+
+
+@router.get(
+    "/ready",
+    summary="Проверка готовности",
+    description=(
+        "Проверяет доступность БД (и шардов), наличие схемы и отсутствие "
+        "насыщения: задержку цикла событий, очередь хеширования паролей, "
+        "занятость пулов соединений. Отвечает 503, если сервис не готов. "
+        "`degraded` – сервис готов, но выключена проверка утёкших паролей."
+    ),
+    response_model=ReadinessSchema,
+    responses={status.HTTP_503_SERVICE_UNAVAILABLE: {"model": ReadinessSchema}},
+)
+async def readiness_probe(response: Response):
+    """Проба готовности для оркестратора и балансировщика."""
+    ready, checks, errors = await readiness.check()
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    degraded = not all(checks[name] for name in DEGRADED_CHECKS)
+    return ReadinessSchema(ready=ready, degraded=degraded, checks=checks, errors=errors)
+
+
+@router.get(
+    "/stats",
+    summary="Показатели насыщения (только для админа)",
+    description=(
+        "Задержка цикла событий, состояние пулов соединений, число выполняющихся "
+        "запросов по маршрутам, очередь хеширования паролей и попадания в "
+        "заранее собранные запросы к пользователям."
+    ),
+    response_model=RuntimeStatsSchema,
+    responses={status.HTTP_403_FORBIDDEN: {"description": "Недостаточно прав"}},
+)
+async def runtime_stats(payload: Annotated[dict, Depends(get_payload)]):
+    """Возвращает показатели насыщения процесса (только для админа)."""
+    requests = in_flight.snapshot()
+    return RuntimeStatsSchema(
+        loop_lag_ms=loop_monitor.lag * 1000,
+        loop_lag_max_ms=loop_monitor.max_lag * 1000,
+        pools=pool_monitor.stats(),
+        in_flight=requests,
+        in_flight_total=sum(requests.values()),
+        hashing_workers=password_hasher.workers,
+        hashing_in_flight=password_hasher.in_flight,
+        hashing_queue_depth=password_hasher.queue_depth,
+        hashing_completed=password_hasher.completed,
+        user_statements=statement_stats.snapshot(),
+    )
@@ -0,0 +1,49 @@
+import secrets
+from typing import Annotated
+from fastapi import APIRouter, Header, HTTPException, status
+
+from src.api.schemas.introspection import (
+    IntrospectRequestSchema,
+    IntrospectResponseSchema,
+)
+from src.api.services.introspection import IntrospectionService
+from src.config import settings
+from src.db.engine import get_async_session
+from src.db.uow import UnitOfWork
+
+
+router = APIRouter()
+
+
+@router.post(
+    "/",
+    summary="Пакетная интроспекция токенов",
+    description=(
+        "Сервисный эндпоинт для шлюзов: проверяет до INTROSPECTION_MAX_BATCH токенов "
+        "за один запрос и возвращает payload или ошибку для каждого. "
+        "Требует заголовок X-Service-Key."
+    ),
+    response_model=IntrospectResponseSchema,
+    response_model_exclude_none=True,
+    responses={
+        status.HTTP_401_UNAUTHORIZED: {"description": "Неверный ключ сервиса"},
+        status.HTTP_404_NOT_FOUND: {"description": "Интроспекция выключена"},
+    },
+)
+async def introspect_tokens(
+    request: IntrospectRequestSchema,
+    x_service_key: Annotated[str | None, Header()] = None,
+):
+    """Проверяет пакет токенов (для сервисов)."""
+    if not settings.INTROSPECTION_KEY:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    if not x_service_key or not secrets.compare_digest(
+        x_service_key, settings.INTROSPECTION_KEY
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Неверный ключ сервиса"
+        )
+    async with UnitOfWork(get_async_session) as uow:
+        service = IntrospectionService(uow)
+        results = await service.introspect(request.tokens)
+    return IntrospectResponseSchema(results=results)
@@ -1,34 +1,83 @@
-from typing import Annotated, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Annotated
+from fastapi import APIRouter, Depends, Query, Request
 
 from src.api.dependencies.user import get_payload
-from src.api.schemas.mock import Product, Order
-from src.db.roles import UserRole
+from src.api.schemas.mock import Customer, OrderWithProduct, Product
+from src.api.schemas.pagination import Page
+from src.api.services.catalog import CatalogService
+from src.api.services.catalog_cache import catalog_cache
+from src.db.engine import get_async_session
+from src.db.uow import UnitOfWork
 
 
 router = APIRouter()
 
-
-MOCK_PRODUCTS: list[Product] = [
-    Product(id=1, name="Keyboard", price=49.99),
-    Product(id=2, name="Mouse", price=19.99),
+AfterQuery = Annotated[
+    int | None, Query(ge=0, description="Курсор: id последней записи предыдущей страницы")
 ]
+LimitQuery = Annotated[int, Query(ge=1, le=500, description="Размер страницы")]
 
-MOCK_ORDERS: list[Order] = [
-    Order(id=1, product_id=1, quantity=2),
-    Order(id=2, product_id=2, quantity=1),
-]
 
+def _state(resource: str):
+    async def load():
+        async with UnitOfWork(get_async_session) as uow:
+            return await CatalogService(uow).state(resource)
+
+    return load
 
-@router.get("/products", response_model=List[Product], summary="Mock: список товаров")
-async def list_products(payload: Annotated[dict, Depends(get_payload)]):
-    return MOCK_PRODUCTS
+
+@router.get("/products", response_model=Page[Product], summary="Mock: список товаров")
+async def list_products(
+    request: Request,
+    payload: Annotated[dict, Depends(get_payload)],
+    after: AfterQuery = None,
+    limit: LimitQuery = 50,
+):
+    async def load():
+        async with UnitOfWork(get_async_session) as uow:
+            return await CatalogService(uow).list_products(after=after, limit=limit)
+
+    return await catalog_cache.respond(
+        request, "products", load, f"{after}:{limit}", _state("products")
+    )
 
 
 @router.get(
     "/orders",
-    response_model=List[Order],
-    summary="Mock: список заказов, доступно только аутентифицированным пользователям",
+    response_model=Page[OrderWithProduct],
+    summary="Mock: список заказов (только для админа)",
 )
-async def list_orders(payload: Annotated[dict, Depends(get_payload)]):
-    return MOCK_ORDERS
+async def list_orders(
+    request: Request,
+    payload: Annotated[dict, Depends(get_payload)],
+    after: AfterQuery = None,
+    limit: LimitQuery = 50,
+    product_id: Annotated[int | None, Query(ge=1)] = None,
+):
+    async def load():
+        async with UnitOfWork(get_async_session) as uow:
+            return await CatalogService(uow).list_orders(
+                after=after, limit=limit, product_id=product_id
+            )
+
+    return await catalog_cache.respond(
+        request, "orders", load, f"{after}:{limit}:{product_id}", _state("orders")
+    )
+
+
+@router.get(
+    "/customers", response_model=Page[Customer], summary="Mock: список покупателей"
+)
+async def list_customers(
+    request: Request,
+    payload: Annotated[dict, Depends(get_payload)],
+    after: AfterQuery = None,
+    limit: LimitQuery = 50,
+):
+    async def load():
+        async with UnitOfWork(get_async_session) as uow:
+            return await CatalogService(uow).list_customers(after=after, limit=limit)
+
+    return await catalog_cache.respond(
+        request, "customers", load, f"{after}:{limit}", _state("customers")
+    )
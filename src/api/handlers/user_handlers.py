@@ -1,14 +1,12 @@
-import stat
 from typing import Annotated
-from fastapi import APIRouter, Depends, HTTPException, Path, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Path, Request, Response, status
 
 from src.api.dependencies.user import get_payload
 from src.api.schemas.edit_profile import UserUpdateSchema
 from src.api.services.utils import ModeDelete
-from src.config import settings
 from src.api.schemas.login import ChangePasswordUserSchema, LoginUserSchema
-from src.api.schemas.delete import UserDeleteScheme
 from src.api.schemas.register import CreateUserSchema
+from src.api.schemas.session import SessionSchema
 from src.api.services.user import UserService
 from src.db.engine import get_async_session
 from src.db.roles import UserRole
@@ -66,12 +64,16 @@ async def register_user(schema: CreateUserSchema):
         },
     },
 )
-async def login_user(data: LoginUserSchema, response: Response):
+async def login_user(data: LoginUserSchema, request: Request, response: Response):
     """Аутентификация пользователя и установка JWT в cookie."""
     try:
         async with UnitOfWork(get_async_session) as uow:
             service = UserService(uow)
-            token = await service.login_user(data=data, response=response)
+            token = await service.login_user(
+                data=data,
+                response=response,
+                device=request.headers.get("user-agent"),
+            )
         return token
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -80,7 +82,7 @@ async def login_user(data: LoginUserSchema, response: Response):
 @router.post(
     "/logout",
     summary="Выход из системы",
-    description="Удаляет JWT-токен из cookie.",
+    description="Удаляет JWT-токен из cookie (в режиме серверных сессий также отзывает сессию).",
     status_code=status.HTTP_200_OK,
     responses={
         status.HTTP_200_OK: {
@@ -91,14 +93,66 @@ async def login_user(data: LoginUserSchema, response: Response):
         }
     },
 )
-async def logout_user(response: Response):
-    """Выход пользователя: удаление JWT из cookie."""
-    response.delete_cookie(
-        key="access_token", httponly=True, secure=False, samesite="lax"
-    )
+async def logout_user(request: Request, response: Response):
+    """Выход пользователя: отзыв сессии и удаление токена из cookie."""
+    async with UnitOfWork(get_async_session) as uow:
+        service = UserService(uow)
+        await service.logout_user(
+            token=request.cookies.get("access_token"), response=response
+        )
     return {status.HTTP_200_OK: "Вы успешно вышли из системы"}
 
 
+@router.get(
+    "/sessions",
+    summary="Активные сессии",
+    description="Список активных серверных сессий (устройств) текущего пользователя. Доступно при AUTH_MODE=session.",
+    response_model=list[SessionSchema],
+    responses={status.HTTP_400_BAD_REQUEST: {"description": "Серверные сессии не включены"}},
+)
+async def list_sessions(payload: Annotated[dict, Depends(get_payload)]):
+    """Возвращает активные сессии текущего пользователя."""
+    try:
+        async with UnitOfWork(get_async_session) as uow:
+            service = UserService(uow)
+            sessions = await service.list_sessions(payload=payload)
+        return [
+            SessionSchema.model_validate(session).model_copy(
+                update={"current": session.id == payload["sid"]}
+            )
+            for session in sessions
+        ]
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.delete(
+    "/sessions/{session_id}",
+    summary="Завершить сессию",
+    description="Отзывает одну из сессий текущего пользователя (выход с устройства).",
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Сессия завершена",
+            "content": {"application/json": {"example": {"200": "Сессия завершена"}}},
+        },
+        status.HTTP_400_BAD_REQUEST: {"description": "Сессия не найдена"},
+    },
+)
+async def revoke_session(
+    session_id: Annotated[int, Path(description="Идентификатор сессии")],
+    payload: Annotated[dict, Depends(get_payload)],
+):
+    """Отзывает сессию текущего пользователя по идентификатору."""
+    try:
+        async with UnitOfWork(get_async_session) as uow:
+            service = UserService(uow)
+            await service.revoke_session(payload=payload, session_id=session_id)
+        return {status.HTTP_200_OK: "Сессия завершена"}
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
 @router.patch(
     "/password",
     summary="Изменить Пароль",
@@ -173,26 +227,18 @@ async def update_profile(
 async def change_own_role(
     response: Response, payload: Annotated[dict, Depends(get_payload)], password: str
 ):
-    if payload["role"] != UserRole.ADMIN:
-        if password == settings.ADMIN_PASSWORD:
-            async with UnitOfWork(get_async_session) as uow:
-                service = UserService(uow)
-                await service.change_user_role(
-                    payload, UserRole.ADMIN, response=response
-                )
-
-            return {
-                status.HTTP_200_OK: f"Админка успешно добавлена!В аккаунт необходимо зайти заново"
-            }
-
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Неверный пароль для админа",
+    """Выдаёт текущему пользователю роль ADMIN при верном админ-пароле."""
+    try:
+        async with UnitOfWork(get_async_session) as uow:
+            service = UserService(uow)
+            await service.change_user_role(
+                payload, UserRole.ADMIN, response=response, admin_password=password
             )
-    raise HTTPException(
-        status_code=status.HTTP_400_BAD_REQUEST, detail="У вас уже активна роль админа"
-    )
+        return {
+            status.HTTP_200_OK: f"Админка успешно добавлена!В аккаунт необходимо зайти заново"
+        }
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.delete(
@@ -0,0 +1,199 @@
+import asyncio
+import hashlib
+from typing import Iterable
+
+from fastapi.routing import APIRoute
+from starlette.datastructures import Headers
+from starlette.requests import cookie_parser
+from starlette.responses import JSONResponse
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import settings
+from src.infra.idempotency import IdempotencyStore, StoredResponse, idempotency_store
+
+MAX_KEY_LENGTH = 255
+MUTATING_METHODS = ("POST", "PATCH", "DELETE")
+
+# Маршруты (метод, полный путь), поддерживающие заголовок `Idempotency-Key`.
+IDEMPOTENT_ROUTES: set[tuple[str, str]] = {
+    ("POST", "/api/v1/users/"),
+    ("PATCH", "/api/v1/users/password"),
+    ("PATCH", "/api/v1/users/{user_oid}/role"),
+    ("DELETE", "/api/v1/users/"),
+}
+
+
+def compile_idempotent_routes(routes: Iterable) -> list[tuple[str, APIRoute]]:
+    """Возвращает пары (метод, маршрут) из `IDEMPOTENT_ROUTES`.
+
+    Вызывается один раз при создании приложения. Запись таблицы, которой
+    не соответствует ни один маршрут, считается ошибкой конфигурации.
+    """
+    compiled: list[tuple[str, APIRoute]] = []
+    for route in routes:
+        if not isinstance(route, APIRoute):
+            continue
+        for method in route.methods:
+            if (method, route.path) in IDEMPOTENT_ROUTES:
+                compiled.append((method, route))
+    unknown = IDEMPOTENT_ROUTES - {(method, route.path) for method, route in compiled}
+    if unknown:
+        raise ValueError(
+            f"В таблице идемпотентных маршрутов указаны несуществующие маршруты: {unknown}"
+        )
+    return compiled
+
+
+class IdempotencyMiddleware:
+    """Повторная отдача ответов на запросы с заголовком `Idempotency-Key`.
+
+    Для маршрутов из `IDEMPOTENT_ROUTES` первый ответ (кроме 5xx) на ключ
+    сохраняется в `IdempotencyStore` и отдаётся на повторы без выполнения
+    обработчика, с заголовком `Idempotency-Replayed: true`. Ключ действует
+    в пределах учётных данных клиента (cookie `access_token`), а повтор с тем
+    же ключом, но другим запросом (метод, путь, query, тело) получает 422.
+    Одновременные повторы ждут результат первого запроса.
+    """
+
+    def __init__(self, app: ASGIApp, store: IdempotencyStore = idempotency_store):
+        self.app = app
+        self.store = store
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in MUTATING_METHODS:
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        idempotency_key = headers.get("idempotency-key")
+        if idempotency_key is None or not self._matches(scope):
+            await self.app(scope, receive, send)
+            return
+        if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+            await JSONResponse(
+                {
+                    "detail": f"Idempotency-Key должен быть от 1 до {MAX_KEY_LENGTH} символов"
+                },
+                status_code=400,
+            )(scope, receive, send)
+            return
+
+        body = await _read_body(receive)
+        token = cookie_parser(headers.get("cookie", "")).get("access_token", "")
+        key = hashlib.sha256(f"{token}\0{idempotency_key}".encode()).hexdigest()
+        fingerprint = hashlib.sha256(
+            b"\0".join(
+                [
+                    scope["method"].encode(),
+                    scope["path"].encode(),
+                    scope["query_string"],
+                    body,
+                ]
+            )
+        ).hexdigest()
+
+        # Проверка и захват слота выполняются без await между ними: иначе
+        # одновременные повторы, пока первый ждёт `lookup` из БД, не увидели бы
+        # друг друга и выполнили обработчик дважды.
+        if (inflight := self.store.inflight(key)) is not None:
+            inflight_fingerprint, future = inflight
+            if inflight_fingerprint != fingerprint:
+                await _mismatch(scope, receive, send)
+                return
+            stored = await asyncio.shield(future)
+            if stored is None:
+                await JSONResponse(
+                    {
+                        "detail": "Запрос с этим Idempotency-Key не завершился, повторите его"
+                    },
+                    status_code=409,
+                )(scope, receive, send)
+                return
+            await _respond(stored, fingerprint, scope, receive, send)
+            return
+
+        future = self.store.begin(key, fingerprint)
+        result: StoredResponse | None = None
+        try:
+            stored = await self.store.lookup(key)
+            if stored is not None:
+                result = stored
+                await _respond(stored, fingerprint, scope, receive, send)
+                return
+
+            start: Message = {}
+            chunks: list[bytes] = []
+
+            async def capture(message: Message) -> None:
+                nonlocal start
+                if message["type"] == "http.response.start":
+                    start = message
+                elif message["type"] == "http.response.body":
+                    chunks.append(message.get("body", b""))
+                await send(message)
+
+            sent = False
+
+            async def replay_body() -> Message:
+                nonlocal sent
+                if not sent:
+                    sent = True
+                    return {"type": "http.request", "body": body, "more_body": False}
+                return await receive()
+
+            await self.app(scope, replay_body, capture)
+            response_body = b"".join(chunks)
+            if start and start["status"] < 500:
+                if len(response_body) <= settings.IDEMPOTENCY_MAX_BODY_BYTES:
+                    result = await self.store.save(
+                        key,
+                        fingerprint,
+                        start["status"],
+                        list(start.get("headers", [])),
+                        response_body,
+                    )
+        finally:
+            self.store.end(key)
+            future.set_result(result)
+
+    def _matches(self, scope: Scope) -> bool:
+        for method, route in scope["app"].state.idempotent_routes:
+            if method == scope["method"] and route.matches(scope)[0] == Match.FULL:
+                return True
+        return False
+
+
+async def _read_body(receive: Receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            return b"".join(chunks)
+
+
+async def _respond(
+    stored: StoredResponse, fingerprint: str, scope: Scope, receive: Receive, send: Send
+) -> None:
+    if stored.fingerprint != fingerprint:
+        await _mismatch(scope, receive, send)
+    else:
+        await _replay(stored, send)
+
+
+async def _replay(stored: StoredResponse, send: Send) -> None:
+    await send(
+        {
+            "type": "http.response.start",
+            "status": stored.status_code,
+            "headers": [*stored.headers, (b"idempotency-replayed", b"true")],
+        }
+    )
+    await send({"type": "http.response.body", "body": stored.body})
+
+
+async def _mismatch(scope: Scope, receive: Receive, send: Send) -> None:
+    await JSONResponse(
+        {"detail": "Idempotency-Key уже использован с другим запросом"},
+        status_code=422,
+    )(scope, receive, send)
@@ -0,0 +1,12 @@
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class UserActivitySchema(BaseModel):
+    """Активность пользователя: последний вход, последний запрос и неудачные входы."""
+
+    uuid: str
+    email: str
+    last_login_at: datetime | None
+    last_seen_at: datetime | None
+    failed_login_attempts: int
@@ -0,0 +1,17 @@
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict
+
+from src.db.model_audit import AuditAction
+
+
+class AuditRecordSchema(BaseModel):
+    """Запись журнала аудита."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    created_at: datetime
+    action: AuditAction
+    email: str
+    actor: str | None
+    details: str | None
@@ -0,0 +1,47 @@
+from pydantic import BaseModel
+
+
+class ReadinessSchema(BaseModel):
+    """Результат проверки готовности сервиса.
+
+    `degraded` – сервис готов, но часть защиты выключена (см. `checks`).
+    """
+
+    ready: bool
+    degraded: bool = False
+    checks: dict[str, bool]
+    errors: list[str]
+
+
+class PoolStatsSchema(BaseModel):
+    """Состояние и счётчики пула соединений БД."""
+
+    size: int
+    checked_out: int
+    overflow: int
+    max_overflow: int
+    checkouts: int
+    exhausted: int
+
+
+class StatementStatsSchema(BaseModel):
+    """Попадания в заранее собранные запросы репозитория пользователей."""
+
+    hits: dict[str, int]
+    misses: dict[str, int]
+    hit_ratio: float
+
+
+class RuntimeStatsSchema(BaseModel):
+    """Показатели насыщения процесса."""
+
+    loop_lag_ms: float
+    loop_lag_max_ms: float
+    pools: dict[str, PoolStatsSchema]
+    in_flight: dict[str, int]
+    in_flight_total: int
+    hashing_workers: int
+    hashing_in_flight: int
+    hashing_queue_depth: int
+    hashing_completed: int
+    user_statements: StatementStatsSchema
@@ -0,0 +1,30 @@
+from typing import Annotated
+from pydantic import BaseModel, Field
+
+from src.config import settings
+
+
+class IntrospectRequestSchema(BaseModel):
+    """Пакет токенов на проверку."""
+
+    tokens: list[Annotated[str, Field(max_length=4096)]] = Field(
+        min_length=1, max_length=settings.INTROSPECTION_MAX_BATCH
+    )
+
+
+class IntrospectResultSchema(BaseModel):
+    """Результат проверки одного токена.
+
+    При `active=true` заполнен `payload`, иначе – `error`
+    (`invalid_token`, `inactive_user` или `revoked`).
+    """
+
+    active: bool
+    payload: dict | None = None
+    error: str | None = None
+
+
+class IntrospectResponseSchema(BaseModel):
+    """Результаты в том же порядке, что и токены в запросе."""
+
+    results: list[IntrospectResultSchema]
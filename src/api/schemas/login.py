@@ -1,7 +1,8 @@
 import string
 from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator
 
-from src.auth.jwt import Auth
+from src.auth.breached import breached_passwords
+from src.auth.hashing import password_hasher
 
 
 class LoginUserSchema(BaseModel):
@@ -10,9 +11,9 @@ class LoginUserSchema(BaseModel):
     email: EmailStr
     password: str = Field(min_length=8, max_length=50)
 
-    def check_password(self, hashed_password) -> bool:
+    async def check_password(self, hashed_password) -> bool:
         """Проверяет введённый пароль относительно хеша из БД."""
-        return Auth().verify_password(self.password, hashed_password)
+        return await password_hasher.verify(self.password, hashed_password)
 
 
 class ChangePasswordUserSchema(BaseModel):
@@ -33,6 +34,14 @@ class ChangePasswordUserSchema(BaseModel):
             raise ValueError("Пароль должен содержать хотя бы один специальный символ")
         return password_value
 
+    @field_validator("new_password", mode="after")
+    def password_must_not_be_breached(cls, password_value: str) -> str:
+        if breached_passwords.is_breached(password_value):
+            raise ValueError(
+                "Пароль встречается в утечках паролей, выберите другой пароль"
+            )
+        return password_value
+
     @model_validator(mode="after")
     def passwords_match(
         cls, model: "ChangePasswordUserSchema"
@@ -41,6 +50,6 @@ class ChangePasswordUserSchema(BaseModel):
             raise ValueError("Пароли не совпадают")
         return model
 
-    def check_password(self, hashed_password) -> bool:
+    async def check_password(self, hashed_password) -> bool:
         """Проверяет текущий пароль относительно хеша из БД."""
-        return Auth().verify_password(self.recent_password, hashed_password)
+        return await password_hasher.verify(self.recent_password, hashed_password)
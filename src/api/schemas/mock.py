@@ -1,19 +1,33 @@
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, ConfigDict, Field, EmailStr
 
 
 class Product(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int = Field(ge=1)
     name: str
     price: float = Field(ge=0)
 
 
 class Order(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int = Field(ge=1)
     product_id: int = Field(ge=1)
+    customer_id: int | None = Field(None, ge=1)
     quantity: int = Field(ge=1)
 
 
+class OrderWithProduct(Order):
+    """Заказ вместе с данными товара."""
+
+    product: Product
+
+
 class Customer(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int = Field(ge=1)
     email: EmailStr
     full_name: str
+
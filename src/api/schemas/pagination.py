@@ -0,0 +1,16 @@
+from typing import Generic, TypeVar
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """Страница keyset-пагинации.
+
+    `next_cursor` передаётся в параметр курсора следующего запроса
+    (`after` для списков, `offset` для поиска); None означает,
+    что записей больше нет.
+    """
+
+    items: list[T]
+    next_cursor: int | str | None = None
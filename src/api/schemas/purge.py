@@ -0,0 +1,23 @@
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict
+
+
+class PurgeStatusSchema(BaseModel):
+    """Состояние фоновой очистки деактивированных пользователей."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    running: bool
+    runs: int
+    purged: int
+    stamped: int
+    batches: int
+    failed_runs: int
+    vacuumed_pages: int
+    vacuum_available: bool | None
+    run_pending: int
+    run_purged: int
+    longest_batch_seconds: float
+    last_run_started_at: datetime | None
+    last_run_finished_at: datetime | None
+    last_error: str | None
@@ -1,8 +1,8 @@
-from pyexpat import model
 import string
-from pydantic import BaseModel, EmailStr, Field, field_serializer, field_validator, model_validator
+from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator
 
-from src.auth.jwt import Auth
+from src.auth.breached import breached_passwords
+from src.auth.hashing import password_hasher
 
 
 class CreateUserSchema(BaseModel):
@@ -17,9 +17,9 @@ class CreateUserSchema(BaseModel):
         min_length=8, max_length=50, exclude=True, examples=["P@ssw0rd!"]
     )
 
-    def hash_password(self) -> "CreateUserSchema":
+    async def hash_password(self) -> "CreateUserSchema":
         """Хеширует пароль и возвращает self для дальнейшего использования."""
-        self.password = Auth().hash_password(self.password)
+        self.password = await password_hasher.hash(self.password)
         return self
 
     @field_validator("password", mode="after")
@@ -29,8 +29,16 @@ class CreateUserSchema(BaseModel):
             raise ValueError("Пароль должен содержать хотя бы один специальный символ")
         return password_value
 
+    @field_validator("password", mode="after")
+    def password_must_not_be_breached(cls, password_value: str) -> str:
+        if breached_passwords.is_breached(password_value):
+            raise ValueError(
+                "Пароль встречается в утечках паролей, выберите другой пароль"
+            )
+        return password_value
+
     @model_validator(mode="after")
     def passwords_match(cls, model: "CreateUserSchema") -> "CreateUserSchema":
         if model.password != model.confirm_password:
             raise ValueError("Пароли не совпадают")
-        return model
\ No newline at end of file
+        return model
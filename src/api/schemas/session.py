@@ -0,0 +1,14 @@
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict
+
+
+class SessionSchema(BaseModel):
+    """Серверная сессия пользователя (одно устройство)."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    device: str | None
+    created_at: datetime
+    expires_at: datetime
+    current: bool = False
@@ -0,0 +1,15 @@
+from pydantic import BaseModel, ConfigDict
+
+
+class UserSummarySchema(BaseModel):
+    """Краткие данные пользователя для поиска, списков и экспорта."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    uuid: str
+    name: str
+    last_name: str
+    surname: str
+    email: str
+    role: str
+    is_active: bool
@@ -0,0 +1,96 @@
+from dataclasses import dataclass
+from typing import ClassVar, Type
+
+from src.api.schemas.mock import Customer, Order, OrderWithProduct, Product
+from src.api.schemas.pagination import Page
+from src.api.services.catalog_cache import catalog_cache
+from src.db.uow import UnitOfWork
+from src.infra.repositories.catalog import (
+    CustomerRepository,
+    OrderRepository,
+    ProductRepository,
+)
+
+
+@dataclass
+class CatalogService:
+    """Сервис каталога: товары, заказы и покупатели.
+
+    Отдаёт страницы keyset-пагинации и сбрасывает кэш ответов каталога
+    (`catalog_cache`) после коммита любых изменений данных.
+    """
+
+    product_repository: ClassVar[Type[ProductRepository]] = ProductRepository
+    order_repository: ClassVar[Type[OrderRepository]] = OrderRepository
+    customer_repository: ClassVar[Type[CustomerRepository]] = CustomerRepository
+    uow: UnitOfWork
+
+    async def list_products(self, after: int | None, limit: int) -> Page[Product]:
+        """Возвращает страницу товаров."""
+        rows = await self.product_repository(session=self.uow.session).get_page(
+            after=after, limit=limit
+        )
+        return _page([Product.model_validate(row) for row in rows], limit)
+
+    async def list_customers(self, after: int | None, limit: int) -> Page[Customer]:
+        """Возвращает страницу покупателей."""
+        rows = await self.customer_repository(session=self.uow.session).get_page(
+            after=after, limit=limit
+        )
+        return _page([Customer.model_validate(row) for row in rows], limit)
+
+    async def list_orders(
+        self, after: int | None, limit: int, product_id: int | None = None
+    ) -> Page[OrderWithProduct]:
+        """Возвращает страницу заказов с товарами, опционально по `product_id`."""
+        rows = await self.order_repository(
+            session=self.uow.session
+        ).get_page_with_products(after=after, limit=limit, product_id=product_id)
+        items = [
+            OrderWithProduct(
+                **Order.model_validate(order).model_dump(),
+                product=Product.model_validate(product),
+            )
+            for order, product in rows
+        ]
+        return _page(items, limit)
+
+    async def state(self, resource: str) -> tuple:
+        """Возвращает состояние таблиц ресурса каталога в БД.
+
+        Меняется при любой вставке или удалении, в том числе из другого
+        процесса, и служит версией данных для `catalog_cache`.
+        """
+        session = self.uow.session
+        if resource == "products":
+            return await self.product_repository(session=session).state()
+        if resource == "customers":
+            return await self.customer_repository(session=session).state()
+        if resource == "orders":
+            return (
+                *await self.order_repository(session=session).state(),
+                *await self.product_repository(session=session).state(),
+            )
+        raise ValueError(f"Неизвестный ресурс каталога: {resource}")
+
+    async def add_products(self, rows: list[dict]) -> None:
+        """Добавляет товары пачкой."""
+        await self.product_repository(session=self.uow.session).add_many(rows)
+        self.uow.after_commit(lambda: catalog_cache.invalidate("products"))
+        self.uow.after_commit(lambda: catalog_cache.invalidate("orders"))
+
+    async def add_customers(self, rows: list[dict]) -> None:
+        """Добавляет покупателей пачкой."""
+        await self.customer_repository(session=self.uow.session).add_many(rows)
+        self.uow.after_commit(lambda: catalog_cache.invalidate("customers"))
+
+    async def add_orders(self, rows: list[dict]) -> None:
+        """Добавляет заказы пачкой."""
+        await self.order_repository(session=self.uow.session).add_many(rows)
+        self.uow.after_commit(lambda: catalog_cache.invalidate("orders"))
+
+
+def _page(items: list, limit: int) -> Page:
+    """Собирает страницу; курсор есть только у полностью заполненной страницы."""
+    next_cursor = items[-1].id if len(items) == limit else None
+    return Page(items=items, next_cursor=next_cursor)
@@ -0,0 +1,181 @@
+import gzip
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Hashable
+
+from fastapi import Request, Response, status
+from fastapi.encoders import jsonable_encoder
+
+from src.config import settings
+
+
+GZIP_MIN_SIZE = 512  # меньшие ответы сжимать невыгодно
+MAX_ENTRIES = 1024  # ответов всех ресурсов и страниц вместе
+
+
+@dataclass
+class CachedBody:
+    """Заранее сериализованное тело ответа для конкретной версии данных."""
+
+    version: int
+    etag: str
+    last_modified: datetime
+    body: bytes
+    gzip_body: bytes | None = None
+
+
+@dataclass
+class CatalogCache:
+    """Кэш ответов каталога с валидаторами `ETag`/`Last-Modified`.
+
+    Для каждого ресурса хранится номер версии и время последнего изменения.
+    Тело ответа сериализуется (и при необходимости сжимается) один раз
+    на версию и вариант (например, страницу); повторные запросы
+    с `If-None-Match`/`If-Modified-Since` получают 304 без обращения
+    к данным и без сериализации.
+    Число хранимых ответов ограничено `max_entries` (вытеснение по LRU).
+
+    Изменения в этом процессе сбрасывают версию сразу (`invalidate` после
+    коммита). Изменения из других процессов обнаруживаются по состоянию
+    таблиц в БД, которое проверяется не чаще раза в `state_ttl` секунд.
+    """
+
+    max_entries: int = MAX_ENTRIES
+    state_ttl: float = settings.CATALOG_STATE_TTL_SECONDS
+
+    _versions: dict[str, int] = field(default_factory=dict)
+    _modified: dict[str, datetime] = field(default_factory=dict)
+    _entries: OrderedDict[tuple[str, str], CachedBody] = field(
+        default_factory=OrderedDict
+    )
+    _states: dict[str, Hashable] = field(default_factory=dict)
+    _checked_at: dict[str, float] = field(default_factory=dict)
+
+    def version(self, resource: str) -> int:
+        """Возвращает текущую версию ресурса."""
+        return self._versions.get(resource, 0)
+
+    def last_modified(self, resource: str) -> datetime:
+        """Возвращает время последнего изменения ресурса (с точностью до секунды)."""
+        if resource not in self._modified:
+            self._modified[resource] = datetime.now(timezone.utc).replace(microsecond=0)
+        return self._modified[resource]
+
+    def invalidate(self, resource: str) -> None:
+        """Повышает версию ресурса и удаляет его закэшированные ответы."""
+        self._versions[resource] = self.version(resource) + 1
+        self._modified[resource] = datetime.now(timezone.utc).replace(microsecond=0)
+        for key in [key for key in self._entries if key[0] == resource]:
+            del self._entries[key]
+
+    async def refresh(
+        self, resource: str, state: Callable[[], Awaitable[Hashable]]
+    ) -> None:
+        """Сбрасывает версию ресурса, если его состояние в БД изменилось."""
+        now = time.monotonic()
+        checked_at = self._checked_at.get(resource)
+        if checked_at is not None and now - checked_at < self.state_ttl:
+            return
+        self._checked_at[resource] = now
+        current = await state()
+        if resource in self._states and self._states[resource] != current:
+            self.invalidate(resource)
+        self._states[resource] = current
+
+    def lookup(self, resource: str, variant: str = "") -> CachedBody | None:
+        """Возвращает ответ для текущей версии ресурса или None."""
+        entry = self._entries.get((resource, variant))
+        if entry and entry.version == self.version(resource):
+            self._entries.move_to_end((resource, variant))
+            return entry
+        return None
+
+    def store(
+        self, resource: str, data: Any, variant: str = "", version: int | None = None
+    ) -> CachedBody:
+        """Сериализует данные и сохраняет ответ для текущей версии ресурса.
+
+        `version` – версия, при которой данные начали загружаться. Если за время
+        загрузки ресурс был изменён (`invalidate`), ответ отдаётся, но не
+        сохраняется: иначе старые данные закэшировались бы под новой версией.
+        """
+        current = self.version(resource)
+        if version is None:
+            version = current
+        body = json.dumps(
+            jsonable_encoder(data), ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+        entry = CachedBody(
+            version=version,
+            etag=f'"{hashlib.sha1(body).hexdigest()}"',
+            last_modified=self.last_modified(resource),
+            body=body,
+            gzip_body=gzip.compress(body, mtime=0) if len(body) >= GZIP_MIN_SIZE else None,
+        )
+        if version != current:
+            return entry
+        self._entries[(resource, variant)] = entry
+        self._entries.move_to_end((resource, variant))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    async def respond(
+        self,
+        request: Request,
+        resource: str,
+        loader: Callable[[], Awaitable[Any]],
+        variant: str = "",
+        state: Callable[[], Awaitable[Hashable]] | None = None,
+    ) -> Response:
+        """Отдаёт ресурс с учётом условных заголовков запроса.
+
+        `state` возвращает состояние данных ресурса в БД (см. `refresh`).
+        `loader` вызывается только если для текущей версии ресурса
+        ещё нет готового ответа.
+        """
+        if state is not None:
+            await self.refresh(resource, state)
+        entry = self.lookup(resource, variant)
+        if entry is None:
+            version = self.version(resource)
+            entry = self.store(resource, await loader(), variant, version)
+
+        headers = {
+            "ETag": entry.etag,
+            "Last-Modified": format_datetime(entry.last_modified, usegmt=True),
+            "Cache-Control": "private, no-cache",
+            "Vary": "Accept-Encoding, Cookie",
+        }
+        if _not_modified(request, entry):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        body = entry.body
+        if entry.gzip_body and "gzip" in request.headers.get("accept-encoding", ""):
+            body = entry.gzip_body
+            headers["Content-Encoding"] = "gzip"
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _not_modified(request: Request, entry: CachedBody) -> bool:
+    """Проверяет `If-None-Match` (приоритетно) и `If-Modified-Since`."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or entry.etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return entry.last_modified <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+catalog_cache = CatalogCache()
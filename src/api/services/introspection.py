@@ -0,0 +1,63 @@
+from dataclasses import dataclass
+from typing import ClassVar, Type
+
+from fastapi import HTTPException
+
+from src.api.schemas.introspection import IntrospectResultSchema
+from src.auth.jwt import Auth
+from src.auth.sessions import session_store
+from src.config import settings
+from src.db.uow import UnitOfWork
+from src.infra.activity import activity_tracker
+from src.infra.repositories.sharded_user import get_user_repository_class
+from src.infra.repositories.user import UserRepository
+
+
+@dataclass
+class IntrospectionService:
+    """Пакетная проверка токенов для шлюзов.
+
+    Каждый токен проверяется так же, как в `get_payload` (декодирование JWT
+    или поиск серверной сессии; сессии, которых нет в кэше, загружаются
+    одним запросом на весь пакет), после чего статусы всех пользователей
+    пакета загружаются одним запросом `WHERE email IN (...)`.
+    """
+
+    user_repository: ClassVar[Type[UserRepository]] = get_user_repository_class()
+    uow: UnitOfWork
+
+    async def introspect(self, tokens: list[str]) -> list[IntrospectResultSchema]:
+        """Возвращает результат проверки для каждого токена в порядке запроса."""
+        payloads: list[dict | None] = []
+        if settings.AUTH_MODE == "session":
+            payloads = await session_store.resolve_many(tokens)
+        else:
+            for token in tokens:
+                try:
+                    payloads.append(Auth().decode_token(token))
+                except HTTPException:
+                    payloads.append(None)
+
+        emails = list({payload["email"] for payload in payloads if payload})
+        users = await self.user_repository.from_uow(self.uow).get_many_by_emails(emails)
+        by_email = {user.email: user for user in users}
+
+        results = []
+        for payload in payloads:
+            if payload is None:
+                results.append(
+                    IntrospectResultSchema(active=False, error="invalid_token")
+                )
+                continue
+            user = by_email.get(payload["email"])
+            if user is None or not user.is_active:
+                results.append(
+                    IntrospectResultSchema(active=False, error="inactive_user")
+                )
+            elif user.role != payload["role"]:
+                # роль сменилась после выдачи токена – токен считается отозванным
+                results.append(IntrospectResultSchema(active=False, error="revoked"))
+            else:
+                activity_tracker.seen(user.email)
+                results.append(IntrospectResultSchema(active=True, payload=payload))
+        return results
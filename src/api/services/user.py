@@ -1,21 +1,26 @@
 from dataclasses import dataclass
-import email
-from http.client import PRECONDITION_FAILED
-from math import e
-from typing import ClassVar, Type
+from datetime import datetime
+from typing import AsyncIterator, ClassVar, Type
 
 from fastapi import Response
-from fastapi.background import P
 
 from src.api.schemas.delete import UserDeleteScheme
 from src.api.schemas.edit_profile import UserUpdateSchema
 from src.api.schemas.login import ChangePasswordUserSchema, LoginUserSchema
 from src.api.schemas.register import CreateUserSchema
 from src.api.services.utils import ModeDelete
+from src.auth.hashing import password_hasher
 from src.auth.jwt import Auth
+from src.auth.permissions import permissions_for
+from src.auth.sessions import session_store
+from src.config import settings
+from src.db.model_audit import AuditAction
 from src.db.model_user import User
 from src.db.roles import UserRole
 from src.db.uow import UnitOfWork
+from src.infra.activity import activity_tracker
+from src.infra.audit import audit_log
+from src.infra.repositories.sharded_user import get_user_repository_class
 from src.infra.repositories.user import UserRepository
 
 
@@ -28,9 +33,19 @@ class UserService:
     `UnitOfWork` и `UserRepository`.
     """
 
-    user_repository: ClassVar[Type[UserRepository]] = UserRepository
+    user_repository: ClassVar[Type[UserRepository]] = get_user_repository_class()
     uow: UnitOfWork
 
+    def _audit(
+        self,
+        action: AuditAction,
+        email: str,
+        actor: str | None = None,
+        details: str | None = None,
+    ) -> None:
+        """Отправляет событие в журнал аудита после успешного коммита."""
+        self.uow.after_commit(lambda: audit_log.emit(action, email, actor, details))
+
     async def register_user(self, data: CreateUserSchema) -> int:
         """Регистрирует нового пользователя.
 
@@ -42,48 +57,84 @@ class UserService:
         Returns:
             int: Идентификатор созданного пользователя.
         """
-        existing = await self.user_repository(session=self.uow.session).get_one_or_none(
+        existing = await self.user_repository.from_uow(self.uow).get_one_or_none(
             email=data.email
         )
         if existing and existing.is_active:
             raise ValueError("Пользователь с таким email уже существует")
-        
+
         if existing and not existing.is_active:
             raise ValueError("Пользователь с таким email был деактивирован")
-        user_data = data.hash_password()
-        user = await self.user_repository(session=self.uow.session).add(data=user_data)
+        user_data = await data.hash_password()
+        user = await self.user_repository.from_uow(self.uow).add(data=user_data)
         return user
 
-    async def login_user(self, data: LoginUserSchema, response: Response) -> str:
+    async def login_user(
+        self, data: LoginUserSchema, response: Response, device: str | None = None
+    ) -> str:
         """Выполняет аутентификацию пользователя.
 
-        Проверяет пароль и, если успешна, создаёт JWT и кладёт его в cookie.
+        Проверяет пароль и, если успешна, создаёт JWT (или серверную сессию
+        в режиме `AUTH_MODE=session`) и кладёт токен в cookie.
 
         Args:
             data: Схема входа (email и пароль).
             response: Ответ FastAPI для установки cookie.
+            device: Описание устройства (User-Agent) для серверной сессии.
 
         Returns:
-            str: Созданный JWT-токен.
+            str: Созданный токен.
         """
-        existing = await self.user_repository(session=self.uow.session).get_one_or_none(
+        existing = await self.user_repository.from_uow(self.uow).get_one_or_none(
             email=data.email
         )
         if existing and existing.is_active:
-            valid_password = data.check_password(existing.password)
+            valid_password = await data.check_password(existing.password)
             if valid_password:
-                token = Auth().create_access_token(
-                    {"email": existing.email, "role": existing.role}
-                )
+                if settings.AUTH_MODE == "session":
+                    token = await session_store.create(self.uow, existing, device)
+                else:
+                    token = Auth().create_access_token(
+                        {
+                            "email": existing.email,
+                            "role": existing.role,
+                            "perms": permissions_for(existing.role),
+                        }
+                    )
                 response.set_cookie(
                     "access_token", token, httponly=True, secure=False
                 )  # В продакшене secure=True, чтобы работал только с Https
+                self._audit(AuditAction.LOGIN, existing.email, details=device)
+                self.uow.after_commit(lambda: activity_tracker.login(existing.email))
                 return token
             else:
+                audit_log.emit(AuditAction.LOGIN_FAILED, data.email, details="password")
+                activity_tracker.login_failed(existing.email)
                 raise ValueError("Неверный пароль")
 
+        audit_log.emit(AuditAction.LOGIN_FAILED, data.email, details="email")
         raise ValueError("Неверный email")
 
+    async def logout_user(self, token: str | None, response: Response) -> None:
+        """Завершает сеанс: отзывает серверную сессию и удаляет cookie."""
+        if token and settings.AUTH_MODE == "session":
+            await session_store.revoke(self.uow, token)
+        response.delete_cookie(
+            key="access_token", httponly=True, secure=False, samesite="lax"
+        )
+
+    async def list_sessions(self, payload: dict) -> list:
+        """Возвращает активные серверные сессии текущего пользователя."""
+        if "sid" not in payload:
+            raise ValueError("Серверные сессии не включены")
+        return await session_store.list_for_user(self.uow, payload["uuid"])
+
+    async def revoke_session(self, payload: dict, session_id: int) -> None:
+        """Отзывает одну из сессий текущего пользователя (выход с устройства)."""
+        if "sid" not in payload:
+            raise ValueError("Серверные сессии не включены")
+        await session_store.revoke_by_id(self.uow, payload["uuid"], session_id)
+
     async def delete_user(
         self,
         payload: dict,
@@ -99,8 +150,8 @@ class UserService:
         email = payload["email"]
         match mode:
             case ModeDelete.SOFT:
-                existing = await self.user_repository(
-                    session=self.uow.session
+                existing = await self.user_repository.from_uow(
+                    self.uow
                 ).get_one_or_none(email=email)
                 if not existing:
                     raise ValueError("Пользователь не найден")
@@ -108,21 +159,24 @@ class UserService:
                 if payload["email"] != existing.email:
                     raise ValueError("Вы можете удалить только свой аккаунт")
                 existing.is_active = False
+                existing.deactivated_at = datetime.now()
+                await session_store.revoke_user(self.uow, existing.uuid)
+                self._audit(AuditAction.DEACTIVATED, existing.email, actor=email)
                 response.delete_cookie(
                     key="access_token", httponly=True, secure=False, samesite="lax"
                 )
 
             case ModeDelete.HARD:
-                existing = await self.user_repository(
-                    session=self.uow.session
+                existing = await self.user_repository.from_uow(
+                    self.uow
                 ).get_one_or_none(email=data.email)
                 if not existing:
                     raise ValueError("Пользователь не найден")
                 if existing.role == UserRole.ADMIN:
                     raise ValueError("Вы не можете удалить другого админа")
-                await self.user_repository(session=self.uow.session).delete(
-                    email=data.email
-                )
+                await session_store.revoke_user(self.uow, existing.uuid)
+                await self.user_repository.from_uow(self.uow).delete(email=data.email)
+                self._audit(AuditAction.DELETED, existing.email, actor=email)
             case _:
                 raise ValueError("Неверный режим удаления")
         return
@@ -133,65 +187,142 @@ class UserService:
         new_role: UserRole,
         oid_user: str = None,
         response: Response = None,
+        admin_password: str | None = None,
     ) -> User:
         """Меняет роль пользователя.
 
-        Если указан `oid_user` — меняет роль целевого пользователя (для админов),
-        иначе — меняет роль пользователя из payload и очищает cookie токена.
+        Если указан `oid_user` — меняет роль целевого пользователя (для админов)
+        и обновляет её в его серверных сессиях, иначе — меняет роль пользователя
+        из payload, отзывает его сессии и очищает cookie токена. Если передан
+        `admin_password`, он проверяется после проверки текущей роли, чтобы
+        ответ пользователю, у которого роль уже установлена, не зависел от пароля.
 
         Returns:
             User: Обновлённый объект пользователя.
         """
         if oid_user:
-            existing = await self.user_repository(
-                session=self.uow.session
-            ).get_one_or_none(uuid=oid_user)
+            existing = await self.user_repository.from_uow(self.uow).get_one_or_none(
+                uuid=oid_user
+            )
             if not existing:
                 raise ValueError("Пользователь не найден")
             if existing.role == new_role or existing.role == UserRole.ADMIN:
                 raise ValueError("Невозможно изменить роль данного пользователя")
 
-            existing.role = new_role
+            old_role = existing.role
+            await self.user_repository.from_uow(self.uow).set_role(
+                existing.uuid, new_role
+            )
+            await session_store.update_role(self.uow, existing.uuid, new_role)
         else:
-            existing = await self.user_repository(
-                session=self.uow.session
-            ).get_one_or_none(email=payload["email"])
+            existing = await self.user_repository.from_uow(self.uow).get_one_or_none(
+                email=payload["email"]
+            )
             if not existing:
                 raise ValueError("Пользователь не найден")
             if existing.role == new_role:
                 raise ValueError("Ваша роль уже установлена")
+            if admin_password is not None and admin_password != settings.ADMIN_PASSWORD:
+                raise ValueError("Неверный пароль для админа")
 
-            existing.role = new_role
+            old_role = existing.role
+            await self.user_repository.from_uow(self.uow).set_role(
+                existing.uuid, new_role
+            )
+            await session_store.revoke_user(self.uow, existing.uuid)
 
             response.delete_cookie(
                 key="access_token", httponly=True, secure=False, samesite="lax"
             )
 
+        self._audit(
+            AuditAction.ROLE_CHANGED,
+            existing.email,
+            actor=payload["email"],
+            details=f"{UserRole(old_role).value} -> {UserRole(new_role).value}",
+        )
         return existing
 
     async def change_user_password(
         self, data: ChangePasswordUserSchema, payload: dict
     ) -> None:
         """Сменяет пароль пользователя после проверки текущего пароля."""
-        existing = await self.user_repository(session=self.uow.session).get_one_or_none(
+        existing = await self.user_repository.from_uow(self.uow).get_one_or_none(
             email=payload["email"]
         )
         if not existing:
             raise ValueError("Пользователь не найден")
 
-        if data.check_password(existing.password):
-            existing.password = Auth().hash_password(data.new_password)
+        if await data.check_password(existing.password):
+            await self.user_repository.from_uow(self.uow).set_password(
+                existing.email, await password_hasher.hash(data.new_password)
+            )
+            self._audit(AuditAction.PASSWORD_CHANGED, existing.email)
             return
 
         raise ValueError("Неверный пароль для аккаунта")
 
+    async def get_user_activity(self, oid_user: str) -> dict:
+        """Возвращает данные активности пользователя.
+
+        К значениям из БД применяется ещё не записанная активность из
+        `activity_tracker`, поэтому ответ не отстаёт от реального состояния.
+        """
+        existing = await self.user_repository.from_uow(self.uow).get_one_or_none(
+            uuid=oid_user
+        )
+        if not existing:
+            raise ValueError("Пользователь не найден")
+
+        activity = {
+            "uuid": existing.uuid,
+            "email": existing.email,
+            "last_login_at": existing.last_login_at,
+            "last_seen_at": existing.last_seen_at,
+            "failed_login_attempts": existing.failed_login_attempts,
+        }
+        pending = activity_tracker.pending(existing.email)
+        if pending:
+            if pending.last_login_at:
+                activity["last_login_at"] = pending.last_login_at
+            if pending.last_seen_at:
+                activity["last_seen_at"] = pending.last_seen_at
+            if pending.reset_failed:
+                activity["failed_login_attempts"] = 0
+            activity["failed_login_attempts"] += pending.failed
+        return activity
+
+    async def list_users(self, after: str | None, limit: int) -> list[User]:
+        """Возвращает страницу пользователей, упорядоченных по email."""
+        return await self.user_repository.from_uow(self.uow).get_page_by_email(
+            after=after, limit=limit
+        )
+
+    async def export_users(self, batch_size: int = 1000) -> AsyncIterator[User]:
+        """Последовательно отдаёт всех пользователей, упорядоченных по email."""
+        repository = self.user_repository.from_uow(self.uow)
+        after = None
+        while True:
+            users = await repository.get_page_by_email(after=after, limit=batch_size)
+            for user in users:
+                yield user
+            if len(users) < batch_size:
+                return
+            after = users[-1].email
+
+    async def search_users(self, query: str, limit: int, offset: int) -> list[User]:
+        """Ищет пользователей по началу слов в ФИО и email."""
+        return await self.user_repository.from_uow(self.uow).search(
+            query, limit=limit, offset=offset
+        )
+
     async def update_user_profile(self, data: UserUpdateSchema, payload: dict) -> User:
         """Обновляет профиль пользователя (имя/фамилия/отчество)."""
-        existing = await self.user_repository(session=self.uow.session).get_one_or_none(
+        existing = await self.user_repository.from_uow(self.uow).get_one_or_none(
             email=payload["email"]
         )
         if existing:
-            await self.user_repository(session=self.uow.session).edit(
+            await self.user_repository.from_uow(self.uow).edit(
                 data=data, exlude_none=True, email=payload["email"]
             )
 
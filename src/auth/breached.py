@@ -0,0 +1,254 @@
+"""Офлайн-проверка паролей по базе утёкших паролей.
+
+Индекс – бинарный файл с отсортированными SHA-1 паролей из утечек:
+
+    заголовок  MAGIC (8 байт) + число хешей (uint64)
+    fanout     65537 × uint64 – номер первого хеша с данными двумя первыми
+               байтами (последний элемент – общее число хешей)
+    хеши       отсортированные 20-байтные SHA-1
+
+Файл отображается в память (`mmap`), поэтому его размер не влияет на
+потребление RAM процессом. Проверка – SHA-1 пароля, чтение двух элементов
+fanout и двоичный поиск внутри корзины (при миллиарде хешей – около 14
+сравнений), то есть единицы микросекунд.
+
+Сборка индекса из текстового дампа (одна строка – SHA-1 в hex, допускается
+суффикс `:число`, как в дампах Have I Been Pwned, или пароль открытым текстом
+с `--plaintext`):
+
+    python -m src.auth.breached --input pwned-passwords-sha1.txt --output breached.idx
+
+Дамп не обязан быть отсортированным: он сортируется по частям во временных
+файлах и сливается, так что сборка тоже не требует памяти под весь дамп.
+Строка, не являющаяся SHA-1 (ровно 40 hex-символов), прерывает сборку
+с указанием номера строки.
+"""
+
+import argparse
+import hashlib
+import heapq
+import logging
+import mmap
+import re
+import struct
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator
+
+from src.config import settings
+
+MAGIC = b"BRCHSHA1"
+DIGEST_SIZE = 20
+FANOUT_SIZE = 1 << 16
+HEADER = struct.Struct("<8sQ")
+FANOUT = struct.Struct(f"<{FANOUT_SIZE + 1}Q")
+DATA_OFFSET = HEADER.size + FANOUT.size
+RUN_SIZE = 5_000_000  # хешей в одной отсортированной части при сборке (~100 МБ)
+HEX_DIGEST = re.compile(rb"[0-9a-fA-F]{%d}" % (DIGEST_SIZE * 2))
+
+logger = logging.getLogger(__name__)
+
+
+class BreachedPasswordIndex:
+    """Отображённый в память индекс SHA-1 утёкших паролей."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self.count = self._validate()
+        except ValueError:
+            self._mmap.close()
+            raise
+
+    def _validate(self) -> int:
+        """Проверяет заголовок и размер файла и возвращает число хешей."""
+        size = len(self._mmap)
+        if size < DATA_OFFSET or (size - DATA_OFFSET) % DIGEST_SIZE:
+            raise ValueError(
+                f"{self.path}: размер {size} байт не соответствует формату индекса"
+            )
+        magic, count = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} не является индексом утёкших паролей")
+        if count != (size - DATA_OFFSET) // DIGEST_SIZE:
+            raise ValueError(
+                f"{self.path}: в заголовке {count} хешей, в файле "
+                f"{(size - DATA_OFFSET) // DIGEST_SIZE}"
+            )
+        (total,) = struct.unpack_from("<Q", self._mmap, HEADER.size + FANOUT_SIZE * 8)
+        if total != count:
+            raise ValueError(f"{self.path}: таблица fanout не соответствует заголовку")
+        return count
+
+    def __contains__(self, password: str) -> bool:
+        return self.contains_digest(hashlib.sha1(password.encode()).digest())
+
+    def contains_digest(self, digest: bytes) -> bool:
+        """Проверяет, есть ли SHA-1 в индексе."""
+        prefix = int.from_bytes(digest[:2], "big")
+        lo, hi = struct.unpack_from("<2Q", self._mmap, HEADER.size + prefix * 8)
+        data = self._mmap
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = DATA_OFFSET + mid * DIGEST_SIZE
+            current = data[start : start + DIGEST_SIZE]
+            if current == digest:
+                return True
+            if current < digest:
+                lo = mid + 1
+            else:
+                hi = mid
+        return False
+
+    def close(self) -> None:
+        """Закрывает отображение файла."""
+        self._mmap.close()
+
+
+class BreachedPasswords:
+    """Проверка паролей по индексу из `BREACHED_PASSWORDS_INDEX`.
+
+    Пустая настройка выключает проверку. Индекс открывается при старте
+    приложения (`load`), чтобы отсутствующий или повреждённый файл
+    обнаруживался сразу, а не на первой регистрации. При `required` такой
+    файл не даёт сервису стартовать; иначе ошибка пишется в лог, проверка
+    выключается до перезапуска, а `available` и `error` показывают это
+    в пробе готовности.
+    """
+
+    def __init__(
+        self,
+        path: str = settings.BREACHED_PASSWORDS_INDEX,
+        required: bool = settings.BREACHED_PASSWORDS_REQUIRED,
+    ):
+        self.path = path
+        self.required = required
+        self.error: str | None = None
+        self._index: BreachedPasswordIndex | None = None
+
+    @property
+    def available(self) -> bool:
+        """False, если проверка включена, но индекс не открыт."""
+        return not self.path or self._index is not None
+
+    def load(self) -> None:
+        """Открывает индекс, если проверка включена."""
+        if not self.path or self._index is not None or self.error is not None:
+            return
+        try:
+            self._index = BreachedPasswordIndex(self.path)
+        except (OSError, ValueError) as e:
+            if self.required:
+                raise
+            self.error = str(e)
+            logger.exception(
+                "Индекс утёкших паролей %s не открыт, проверка выключена", self.path
+            )
+
+    def is_breached(self, password: str) -> bool:
+        """Возвращает True, если пароль встречается в утечках."""
+        self.load()
+        return self._index is not None and password in self._index
+
+    def close(self) -> None:
+        """Закрывает индекс."""
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+
+
+def _parse_digests(lines: Iterable[bytes], plaintext: bool) -> Iterator[bytes]:
+    for number, line in enumerate(lines, start=1):
+        line = line.rstrip(b"\r\n")
+        if not line:
+            continue
+        if plaintext:
+            yield hashlib.sha1(line).digest()
+            continue
+        digest = line.split(b":", 1)[0]
+        if not HEX_DIGEST.fullmatch(digest):
+            raise ValueError(
+                f"Строка {number}: ожидается SHA-1 из {DIGEST_SIZE * 2} hex-символов"
+            )
+        yield bytes.fromhex(digest.decode("ascii"))
+
+
+def _write_run(digests: list[bytes], directory: str) -> Path:
+    digests.sort()
+    with tempfile.NamedTemporaryFile(dir=directory, delete=False) as run:
+        run.write(b"".join(digests))
+    return Path(run.name)
+
+
+def _read_run(file: BinaryIO) -> Iterator[bytes]:
+    while digest := file.read(DIGEST_SIZE):
+        yield digest
+
+
+def build_index(
+    source: BinaryIO,
+    output: str | Path,
+    plaintext: bool = False,
+    run_size: int = RUN_SIZE,
+) -> int:
+    """Строит индекс из текстового дампа и возвращает число уникальных хешей."""
+    fanout = [0] * (FANOUT_SIZE + 1)
+    count = 0
+    with tempfile.TemporaryDirectory(dir=Path(output).parent) as workdir:
+        runs: list[Path] = []
+        digests: list[bytes] = []
+        for digest in _parse_digests(source, plaintext):
+            digests.append(digest)
+            if len(digests) >= run_size:
+                runs.append(_write_run(digests, workdir))
+                digests = []
+        if digests or not runs:
+            runs.append(_write_run(digests, workdir))
+
+        files = [open(run, "rb") for run in runs]
+        try:
+            with open(output, "wb") as out:
+                out.seek(DATA_OFFSET)
+                previous = None
+                for digest in heapq.merge(*(_read_run(file) for file in files)):
+                    if digest == previous:
+                        continue
+                    previous = digest
+                    out.write(digest)
+                    fanout[int.from_bytes(digest[:2], "big") + 1] += 1
+                    count += 1
+                for prefix in range(FANOUT_SIZE):
+                    fanout[prefix + 1] += fanout[prefix]
+                out.seek(0)
+                out.write(HEADER.pack(MAGIC, count))
+                out.write(FANOUT.pack(*fanout))
+        finally:
+            for file in files:
+                file.close()
+    return count
+
+
+breached_passwords = BreachedPasswords()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Сборка индекса утёкших паролей из текстового дампа"
+    )
+    parser.add_argument("--input", type=Path, required=True)
+    parser.add_argument("--output", type=Path, required=True)
+    parser.add_argument(
+        "--plaintext",
+        action="store_true",
+        help="строки дампа – пароли открытым текстом, а не SHA-1",
+    )
+    parser.add_argument("--run-size", type=int, default=RUN_SIZE)
+    args = parser.parse_args()
+    with open(args.input, "rb") as source:
+        try:
+            total = build_index(source, args.output, args.plaintext, args.run_size)
+        except ValueError as error:
+            parser.exit(1, f"{args.input}: {error}\n")
+    print(f"{args.output}: {total} hashes")
@@ -0,0 +1,57 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from src.auth.jwt import Auth
+from src.config import settings
+
+
+class PasswordHasher:
+    """Хеширование и проверка паролей bcrypt в отдельном пуле потоков.
+
+    bcrypt занимает сотни миллисекунд CPU и отпускает GIL, поэтому в пуле
+    из `workers` потоков он не блокирует цикл событий. Число ожидающих
+    своей очереди операций (`queue_depth`) – показатель насыщения сервиса.
+    """
+
+    def __init__(self, workers: int = settings.HASH_WORKERS):
+        self.workers = workers
+        self.in_flight = 0
+        self.completed = 0
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def queue_depth(self) -> int:
+        """Число операций, ожидающих свободного потока."""
+        return max(0, self.in_flight - self.workers)
+
+    async def hash(self, password: str) -> str:
+        """Возвращает bcrypt-хеш пароля."""
+        return await self._run(Auth().hash_password, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """Проверяет пароль относительно хеша."""
+        return await self._run(Auth().verify_password, password, hashed_password)
+
+    def close(self) -> None:
+        """Останавливает пул потоков."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def _run(self, func: Callable, *args):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="bcrypt"
+            )
+        self.in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, func, *args
+            )
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+
+
+password_hasher = PasswordHasher()
@@ -1,12 +1,29 @@
 from datetime import timedelta, datetime
+from functools import cache
 from fastapi import HTTPException
 
-from passlib.context import CryptContext
 import jwt
 
 from src.config import settings
 
 
+@cache
+def get_password_context():
+    """Возвращает контекст хеширования паролей (создаётся при первом обращении).
+
+    Импорт passlib и загрузка бэкенда bcrypt заметно удлиняют старт,
+    поэтому они отложены до первого использования или `warm_password_context`.
+    """
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def warm_password_context() -> None:
+    """Создаёт контекст и загружает бэкенд bcrypt (для вызова в отдельном потоке)."""
+    get_password_context().handler("bcrypt").get_backend()
+
+
 class Auth:
     """Утилиты аутентификации: хеширование паролей и работа с JWT.
 
@@ -14,7 +31,10 @@ class Auth:
     - Создаёт и декодирует JWT-токены доступа
     """
 
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    @property
+    def pwd_context(self):
+        """Контекст хеширования паролей bcrypt."""
+        return get_password_context()
 
     def verify_password(self, plain_password, hashed_password):
         """Проверяет соответствие пароля и его хеша.
@@ -0,0 +1,79 @@
+import enum
+from typing import Iterable
+
+from fastapi.routing import APIRoute
+
+from src.db.roles import UserRole
+
+
+class Permission(enum.IntFlag):
+    """Права доступа. Набор прав роли и токена — битовая маска.
+
+    Значения битов попадают в выданные токены, поэтому новые права
+    добавляются только в конец перечисления.
+    """
+
+    READ_CATALOG = enum.auto()
+    READ_ORDERS = enum.auto()
+    MANAGE_ROLES = enum.auto()
+    DELETE_USERS = enum.auto()
+    VIEW_AUDIT = enum.auto()
+    VIEW_ACTIVITY = enum.auto()
+    SEARCH_USERS = enum.auto()
+    ADMIN_JOKE = enum.auto()
+    LIST_USERS = enum.auto()
+    VIEW_PURGE = enum.auto()
+    VIEW_RUNTIME_STATS = enum.auto()
+
+
+ROLE_PERMISSIONS: dict[str, Permission] = {
+    UserRole.SIMPLE_USER.value: Permission.READ_CATALOG,
+    UserRole.ADMIN.value: Permission(sum(Permission)),
+}
+
+# Какие права нужны для маршрута (метод, полный путь). Маршруты без записи
+# не требуют прав (аутентификацию при необходимости проверяет сам обработчик).
+ROUTE_PERMISSIONS: dict[tuple[str, str], Permission] = {
+    ("PATCH", "/api/v1/users/{user_oid}/role"): Permission.MANAGE_ROLES,
+    ("DELETE", "/api/v1/users/"): Permission.DELETE_USERS,
+    ("POST", "/api/v1/users/admin/joke"): Permission.ADMIN_JOKE,
+    ("GET", "/api/v1/users/audit"): Permission.VIEW_AUDIT,
+    ("GET", "/api/v1/users/search"): Permission.SEARCH_USERS,
+    ("GET", "/api/v1/users/"): Permission.LIST_USERS,
+    ("GET", "/api/v1/users/export"): Permission.LIST_USERS,
+    ("GET", "/api/v1/users/{user_oid}/activity"): Permission.VIEW_ACTIVITY,
+    ("GET", "/api/v1/users/purge"): Permission.VIEW_PURGE,
+    ("GET", "/api/v1/health/stats"): Permission.VIEW_RUNTIME_STATS,
+    ("GET", "/api/v1/mock/products"): Permission.READ_CATALOG,
+    ("GET", "/api/v1/mock/customers"): Permission.READ_CATALOG,
+    ("GET", "/api/v1/mock/orders"): Permission.READ_ORDERS,
+}
+
+
+def permissions_for(role: str) -> int:
+    """Возвращает маску прав роли (0 для неизвестной роли)."""
+    return int(ROLE_PERMISSIONS.get(role, 0))
+
+
+def compile_route_policy(routes: Iterable) -> dict[int, int]:
+    """Собирает таблицу «id объекта маршрута → маска прав» для `authorize`.
+
+    Вызывается один раз при создании приложения. Запись политики, которой
+    не соответствует ни один маршрут, считается ошибкой конфигурации.
+    """
+    policy: dict[int, int] = {}
+    matched: set[tuple[str, str]] = set()
+    for route in routes:
+        if not isinstance(route, APIRoute):
+            continue
+        for method in route.methods:
+            required = ROUTE_PERMISSIONS.get((method, route.path))
+            if required:
+                policy[id(route)] = int(required)
+                matched.add((method, route.path))
+    unknown = set(ROUTE_PERMISSIONS) - matched
+    if unknown:
+        raise ValueError(
+            f"В политике доступа указаны несуществующие маршруты: {unknown}"
+        )
+    return policy
@@ -0,0 +1,235 @@
+import hashlib
+import secrets
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from time import monotonic
+
+from fastapi import HTTPException
+
+from src.auth.permissions import permissions_for
+from src.config import settings
+from src.db.engine import get_async_session
+from src.db.model_user import User
+from src.db.uow import UnitOfWork
+from src.infra.repositories.session import SessionRepository
+
+LOAD_BATCH_SIZE = 500  # token_hash в одном запросе `IN (...)` (лимит параметров SQLite)
+
+
+@dataclass
+class CachedSession:
+    """Запись сессии во фронтовом кэше."""
+
+    id: int
+    user_uuid: str
+    email: str
+    role: str
+    expires_at: datetime
+    persisted_expires_at: datetime
+    cached_at: float
+
+    def payload(self) -> dict:
+        """Возвращает payload в формате, совместимом с JWT-режимом."""
+        return {
+            "email": self.email,
+            "role": self.role,
+            "perms": permissions_for(self.role),
+            "uuid": self.user_uuid,
+            "sid": self.id,
+            "exp": int(self.expires_at.timestamp()),
+        }
+
+
+class SessionStore:
+    """Хранилище серверных сессий с LRU-кэшем в памяти.
+
+    - Клиент получает случайный непрозрачный токен, в БД лежит его SHA-256
+    - Проверка токена — поиск по хешу в LRU-кэше, без обращения к БД
+      и без декодирования; промах кэша — один запрос по уникальному индексу
+      (для пакета токенов — один запрос `IN (...)` на все промахи)
+    - Срок жизни скользящий, но новый `expires_at` пишется в БД не чаще,
+      чем раз в `SESSION_REFRESH_SECONDS`
+    - Записи кэша живут не дольше `SESSION_CACHE_TTL_SECONDS`, чтобы
+      отзыв сессии в другом процессе был виден с ограниченной задержкой
+    """
+
+    def __init__(
+        self,
+        max_size: int = settings.SESSION_CACHE_SIZE,
+        ttl: timedelta = timedelta(minutes=settings.SESSION_EXPIRE_MINUTES),
+        refresh: timedelta = timedelta(seconds=settings.SESSION_REFRESH_SECONDS),
+        cache_ttl: float = settings.SESSION_CACHE_TTL_SECONDS,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.refresh = refresh
+        self.cache_ttl = cache_ttl
+        self._cache: OrderedDict[str, CachedSession] = OrderedDict()
+
+    @staticmethod
+    def hash_token(token: str) -> str:
+        """Возвращает SHA-256 токена в hex."""
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    async def create(self, uow: UnitOfWork, user: User, device: str | None) -> str:
+        """Создаёт сессию пользователя в рамках `uow` и возвращает токен."""
+        token = secrets.token_urlsafe(32)
+        token_hash = self.hash_token(token)
+        now = datetime.now()
+        expires_at = now + self.ttl
+        session_id = await SessionRepository(session=uow.session).add(
+            {
+                "token_hash": token_hash,
+                "user_uuid": user.uuid,
+                "email": user.email,
+                "role": user.role,
+                "device": device[:255] if device else None,
+                "created_at": now,
+                "expires_at": expires_at,
+            }
+        )
+        cached = CachedSession(
+            id=session_id,
+            user_uuid=user.uuid,
+            email=user.email,
+            role=user.role,
+            expires_at=expires_at,
+            persisted_expires_at=expires_at,
+            cached_at=monotonic(),
+        )
+        uow.after_commit(lambda: self._put(token_hash, cached))
+        return token
+
+    async def resolve(self, token: str) -> dict:
+        """Возвращает payload сессии по токену.
+
+        Поднимает HTTPException(401), если сессия не найдена или истекла.
+        """
+        (payload,) = await self.resolve_many([token])
+        if payload is None:
+            raise HTTPException(
+                status_code=401, detail="Could not validate credentials"
+            )
+        return payload
+
+    async def resolve_many(self, tokens: list[str]) -> list[dict | None]:
+        """Возвращает payload сессии для каждого токена (None – не найдена или истекла).
+
+        Промахи кэша загружаются одним запросом, а продление сроков, которое
+        пора записать в БД, – одним UPDATE.
+        """
+        hashes = [self.hash_token(token) for token in tokens]
+        now = datetime.now()
+        found: dict[str, CachedSession] = {}
+        missing: list[str] = []
+        for token_hash in dict.fromkeys(hashes):
+            cached = self._cache.get(token_hash)
+            if cached and monotonic() - cached.cached_at < self.cache_ttl:
+                self._cache.move_to_end(token_hash)
+                found[token_hash] = cached
+            else:
+                missing.append(token_hash)
+        if missing:
+            found.update(await self._load_many(missing))
+
+        expires_at = now + self.ttl
+        to_persist: list[str] = []
+        for token_hash in dict.fromkeys(hashes):
+            cached = found.get(token_hash)
+            if cached is None or cached.expires_at <= now:
+                found.pop(token_hash, None)
+                self._evict(token_hash)
+                continue
+            cached.expires_at = expires_at
+            if expires_at - cached.persisted_expires_at >= self.refresh:
+                to_persist.append(token_hash)
+        if to_persist:
+            async with UnitOfWork(get_async_session) as uow:
+                await SessionRepository(session=uow.session).extend_many(
+                    to_persist, expires_at
+                )
+            for token_hash in to_persist:
+                found[token_hash].persisted_expires_at = expires_at
+        return [
+            found[token_hash].payload() if token_hash in found else None
+            for token_hash in hashes
+        ]
+
+    async def list_for_user(self, uow: UnitOfWork, user_uuid: str):
+        """Возвращает активные сессии пользователя."""
+        now = datetime.now()
+        sessions = await SessionRepository(session=uow.session).get_for_user(user_uuid)
+        return [session for session in sessions if session.expires_at > now]
+
+    async def revoke(self, uow: UnitOfWork, token: str) -> None:
+        """Отзывает сессию по токену."""
+        await self._delete(uow, token_hash=self.hash_token(token))
+
+    async def revoke_by_id(self, uow: UnitOfWork, user_uuid: str, session_id: int) -> None:
+        """Отзывает сессию пользователя по её идентификатору."""
+        deleted = await self._delete(uow, id=session_id, user_uuid=user_uuid)
+        if not deleted:
+            raise ValueError("Сессия не найдена")
+
+    async def revoke_user(self, uow: UnitOfWork, user_uuid: str) -> None:
+        """Отзывает все сессии пользователя (выход со всех устройств)."""
+        await self._delete(uow, user_uuid=user_uuid)
+
+    async def update_role(self, uow: UnitOfWork, user_uuid: str, role: str) -> None:
+        """Меняет роль во всех сессиях пользователя, не разлогинивая его."""
+        hashes = await SessionRepository(session=uow.session).edit(
+            {"role": role}, user_uuid=user_uuid
+        )
+        uow.after_commit(lambda: self._evict_many(hashes))
+
+    async def purge_expired(self) -> int:
+        """Удаляет из БД истёкшие сессии."""
+        async with UnitOfWork(get_async_session) as uow:
+            return await SessionRepository(session=uow.session).delete_expired(
+                datetime.now()
+            )
+
+    async def _delete(self, uow: UnitOfWork, **filter_by) -> list[str]:
+        hashes = await SessionRepository(session=uow.session).delete(**filter_by)
+        self._evict_many(hashes)
+        return hashes
+
+    async def _load_many(self, token_hashes: list[str]) -> dict[str, CachedSession]:
+        rows = []
+        async with UnitOfWork(get_async_session) as uow:
+            repository = SessionRepository(session=uow.session)
+            for start in range(0, len(token_hashes), LOAD_BATCH_SIZE):
+                rows += await repository.get_many_by_hashes(
+                    token_hashes[start : start + LOAD_BATCH_SIZE]
+                )
+        loaded = {}
+        for row in rows:
+            cached = CachedSession(
+                id=row.id,
+                user_uuid=row.user_uuid,
+                email=row.email,
+                role=row.role,
+                expires_at=row.expires_at,
+                persisted_expires_at=row.expires_at,
+                cached_at=monotonic(),
+            )
+            self._put(row.token_hash, cached)
+            loaded[row.token_hash] = cached
+        return loaded
+
+    def _put(self, token_hash: str, cached: CachedSession) -> None:
+        self._cache[token_hash] = cached
+        self._cache.move_to_end(token_hash)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    def _evict(self, token_hash: str) -> None:
+        self._cache.pop(token_hash, None)
+
+    def _evict_many(self, hashes: list[str]) -> None:
+        for token_hash in hashes:
+            self._evict(token_hash)
+
+
+session_store = SessionStore()
@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Literal
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -15,6 +16,83 @@ class Settings(BaseSettings):
 
     ADMIN_PASSWORD: str = Field(default="123")
 
+    # "fast" – схема БД, прогрев пула и bcrypt параллельно, обслуживание в фоне;
+    # "eager" – всё последовательно до приёма запросов
+    STARTUP_MODE: Literal["eager", "fast"] = "fast"
+    # Бюджеты холодного старта для `python -m src.startup_budget`
+    STARTUP_IMPORT_BUDGET_MS: int = 1500
+    STARTUP_FIRST_REQUEST_BUDGET_MS: int = 2500
+
+    # Индекс утёкших паролей (`python -m src.auth.breached`); пустой – проверка выключена
+    BREACHED_PASSWORDS_INDEX: str = ""
+    # True – без индекса сервис не стартует; False – стартует с выключенной
+    # проверкой и сообщает об этом в /api/v1/health/ready
+    BREACHED_PASSWORDS_REQUIRED: bool = False
+
+    # Пул потоков для bcrypt
+    HASH_WORKERS: int = Field(default=4, ge=1)
+
+    # Пороги готовности (/api/v1/health/ready): при превышении сервис
+    # сообщает, что не готов, и балансировщик перестаёт слать ему запросы
+    HEALTH_HEARTBEAT_SECONDS: float = 0.5
+    HEALTH_MAX_LOOP_LAG_MS: int = 500
+    HEALTH_MAX_HASH_QUEUE: int = 32
+    HEALTH_DB_TIMEOUT_SECONDS: float = 2.0
+
+    DATABASE_URL: str = "sqlite+aiosqlite:///./test.db"
+    # Число шардов пользователей; при 1 пользователи хранятся в DATABASE_URL
+    USER_SHARDS: int = Field(default=1, ge=1)
+    USER_SHARD_URL: str = "sqlite+aiosqlite:///./users_shard_{n}.db"
+
+    # "compiled" – частые запросы к пользователям собираются один раз при
+    # импорте и выполняются с привязанными параметрами, "dynamic" – строятся
+    # при каждом вызове
+    USER_REPOSITORY_MODE: Literal["dynamic", "compiled"] = "compiled"
+
+    # "jwt" – stateless JWT в cookie, "session" – непрозрачный токен серверной сессии
+    AUTH_MODE: Literal["jwt", "session"] = "jwt"
+    SESSION_EXPIRE_MINUTES: int = 30
+    SESSION_REFRESH_SECONDS: int = 60
+    SESSION_CACHE_SIZE: int = 10_000
+    SESSION_CACHE_TTL_SECONDS: int = 30
+
+    # Как часто проверять состояние таблиц каталога в БД, чтобы замечать
+    # изменения из других процессов (изменения в своём процессе видны сразу)
+    CATALOG_STATE_TTL_SECONDS: float = 1.0
+
+    # Сколько секунд кэшировать число строк и токенов поискового индекса
+    # шарда (для общего ранга bm25 при шардировании)
+    SEARCH_TOTALS_TTL_SECONDS: float = 30.0
+
+    AUDIT_QUEUE_SIZE: int = 100_000
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_SECONDS: float = 1.0
+    # "drop_oldest" – вытеснять старые события, "drop_new" – отбрасывать новые
+    AUDIT_OVERFLOW: Literal["drop_oldest", "drop_new"] = "drop_oldest"
+    # Повторы неудавшейся пачки, после которых она пишется в резервный файл
+    AUDIT_MAX_RETRIES: int = Field(default=3, ge=0)
+    AUDIT_FALLBACK_PATH: str = "./audit_fallback.jsonl"
+
+    ACTIVITY_FLUSH_SECONDS: float = 10.0
+    ACTIVITY_MAX_PENDING: int = 10_000
+
+    # Ответы на запросы с Idempotency-Key: срок хранения, размер кэша в памяти
+    # (вытесненные ответы сохраняются в БД) и максимальный размер тела
+    IDEMPOTENCY_TTL_SECONDS: int = 86_400
+    IDEMPOTENCY_CACHE_SIZE: int = Field(default=10_000, ge=1)
+    IDEMPOTENCY_MAX_BODY_BYTES: int = 65_536
+
+    # Фоновая очистка деактивированных пользователей; интервал 0 – выключена
+    PURGE_INTERVAL_SECONDS: float = 3600.0
+    PURGE_RETENTION_DAYS: int = Field(default=30, ge=0)
+    PURGE_BATCH_SIZE: int = Field(default=200, ge=1)
+    PURGE_BATCH_PAUSE_SECONDS: float = 0.05
+    PURGE_VACUUM_PAGES: int = Field(default=256, ge=1)
+
+    # Ключ сервисов (шлюзов) для пакетной интроспекции токенов; пустой – эндпоинт выключен
+    INTROSPECTION_KEY: str = ""
+    INTROSPECTION_MAX_BATCH: int = 500
+
     model_config = SettingsConfigDict(env_file=ENV_PATH)
 
 
@@ -1,9 +1,22 @@
+import asyncio
+
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from src.config import settings
 from src.db.model_user import Base
+from src.db.shards import shard_directory, user_shards
+from src.db.user_search import create_user_search_index, sync_user_search_index
+from src.db.vacuum import enable_incremental_vacuum
+from src.db import (
+    model_archive,
+    model_audit,
+    model_catalog,
+    model_idempotency,
+    model_session,
+    model_shard,
+)  # noqa: F401  регистрируют таблицы в Base.metadata
 
-DATABASE_URL = "sqlite+aiosqlite:///./test.db"
-engine = create_async_engine(DATABASE_URL)
+engine = create_async_engine(settings.DATABASE_URL)
 async_session = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
 
@@ -12,7 +25,35 @@ def get_async_session() -> AsyncSession:
     return async_session()
 
 
-async def async_run_db():
-    """Создаёт все таблицы в БД (инициализация схемы)."""
+async def async_run_db(sync_search_index: bool = True):
+    """Создаёт все таблицы в БД (инициализация схемы) и поисковый индекс пользователей.
+
+    В шардированном режиме также создаёт схему шардов и загружает
+    справочник «UUID → шард». При `sync_search_index=False` дозаполнение
+    поискового индекса откладывается (см. `sync_search_indexes`).
+    """
     async with engine.begin() as conn:
+        await conn.run_sync(enable_incremental_vacuum)
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(create_user_search_index, sync_search_index)
+    if user_shards.enabled:
+        await user_shards.create_all(sync_search_index)
+        async with async_session() as session:
+            await shard_directory.load(session)
+
+
+async def sync_search_indexes():
+    """Дозаполняет поисковые индексы пользователей в основной БД и шардах."""
+    for target in [engine, *user_shards.engines]:
+        async with target.begin() as conn:
+            await conn.run_sync(sync_user_search_index)
+
+
+async def warm_pool():
+    """Заранее открывает соединения пула, чтобы первые запросы их не ждали."""
+
+    async def touch():
+        async with engine.connect() as conn:
+            await conn.exec_driver_sql("SELECT 1")
+
+    await asyncio.gather(*(touch() for _ in range(engine.pool.size())))
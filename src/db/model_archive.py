@@ -0,0 +1,26 @@
+from datetime import datetime
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.db.model_user import Base
+
+
+class ArchivedUser(Base):
+    """Архивная запись удалённого фоновой очисткой пользователя.
+
+    Хранит только идентификацию и даты (без пароля и данных активности);
+    лежит в той же БД, что и таблица пользователей, чтобы перенос
+    в архив и удаление выполнялись одной транзакцией.
+    """
+
+    __tablename__ = "users_archive"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    uuid: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    email: Mapped[str] = mapped_column(String(length=255), nullable=False, index=True)
+    name: Mapped[str] = mapped_column(String(length=50), nullable=False)
+    last_name: Mapped[str] = mapped_column(String(length=50), nullable=False)
+    surname: Mapped[str] = mapped_column(String(length=50), nullable=False)
+    role: Mapped[str] = mapped_column(String, nullable=False)
+    deactivated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
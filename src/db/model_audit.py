@@ -0,0 +1,36 @@
+import enum
+from datetime import datetime
+from sqlalchemy import DateTime, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.db.model_user import Base
+
+
+class AuditAction(str, enum.Enum):
+    """Типы событий журнала аудита."""
+
+    LOGIN = "login"
+    LOGIN_FAILED = "login_failed"
+    PASSWORD_CHANGED = "password_changed"
+    ROLE_CHANGED = "role_changed"
+    DEACTIVATED = "deactivated"
+    DELETED = "deleted"
+    PURGED = "purged"
+
+
+class AuditRecord(Base):
+    """Запись журнала аудита аутентификации.
+
+    Таблица только дополняется; выборки идут по времени (`created_at`)
+    и, опционально, по email пользователя.
+    """
+
+    __tablename__ = "audit_log"
+    __table_args__ = (Index("ix_audit_log_email_created_at", "email", "created_at"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+    action: Mapped[str] = mapped_column(String(length=32), nullable=False)
+    email: Mapped[str] = mapped_column(String(length=255), nullable=False)
+    actor: Mapped[str | None] = mapped_column(String(length=255), nullable=True)
+    details: Mapped[str | None] = mapped_column(String(length=255), nullable=True)
@@ -0,0 +1,46 @@
+from sqlalchemy import ForeignKey, Index, Integer, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from src.db.model_user import Base
+
+
+class Product(Base):
+    """Модель товара каталога."""
+
+    __tablename__ = "products"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(length=255), nullable=False)
+    price: Mapped[float] = mapped_column(
+        Numeric(precision=12, scale=2, asdecimal=False), nullable=False
+    )
+
+
+class Customer(Base):
+    """Модель покупателя."""
+
+    __tablename__ = "customers"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    email: Mapped[str] = mapped_column(String(length=255), nullable=False, unique=True)
+    full_name: Mapped[str] = mapped_column(String(length=255), nullable=False)
+
+
+class Order(Base):
+    """Модель заказа.
+
+    Составной индекс `(product_id, id)` обслуживает keyset-пагинацию
+    заказов с фильтром по товару без сортировки в памяти.
+    """
+
+    __tablename__ = "orders"
+    __table_args__ = (Index("ix_orders_product_id_id", "product_id", "id"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id"), nullable=False)
+    customer_id: Mapped[int | None] = mapped_column(
+        ForeignKey("customers.id"), nullable=True, index=True
+    )
+    quantity: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    product: Mapped[Product] = relationship(lazy="raise")
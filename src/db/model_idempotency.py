@@ -0,0 +1,22 @@
+from datetime import datetime
+from sqlalchemy import DateTime, Integer, LargeBinary, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.db.model_user import Base
+
+
+class IdempotencyRecord(Base):
+    """Сохранённый ответ на запрос с заголовком `Idempotency-Key`.
+
+    Сюда попадают ответы, вытесненные из хранилища в памяти, и все
+    непросроченные ответы при остановке сервиса.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    key: Mapped[str] = mapped_column(String(length=64), primary_key=True)
+    fingerprint: Mapped[str] = mapped_column(String(length=64), nullable=False)
+    status_code: Mapped[int] = mapped_column(Integer, nullable=False)
+    headers: Mapped[str] = mapped_column(Text, nullable=False)
+    body: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
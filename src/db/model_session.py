@@ -0,0 +1,24 @@
+from datetime import datetime
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.db.model_user import Base
+
+
+class UserSession(Base):
+    """Модель серверной сессии пользователя.
+
+    Хранит SHA-256 от непрозрачного токена (сам токен в БД не попадает),
+    данные пользователя, нужные для авторизации, устройство и срок жизни.
+    """
+
+    __tablename__ = "sessions"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    token_hash: Mapped[str] = mapped_column(String(length=64), unique=True, nullable=False)
+    user_uuid: Mapped[str] = mapped_column(String, index=True, nullable=False)
+    email: Mapped[str] = mapped_column(String(length=255), nullable=False)
+    role: Mapped[str] = mapped_column(String, nullable=False)
+    device: Mapped[str | None] = mapped_column(String(length=255), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
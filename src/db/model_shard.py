@@ -0,0 +1,17 @@
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.db.model_user import Base
+
+
+class ShardDirectoryEntry(Base):
+    """Запись справочника «UUID пользователя → номер шарда».
+
+    Хранится в основной БД и нужна для поиска пользователя по UUID,
+    когда шард нельзя вычислить из email.
+    """
+
+    __tablename__ = "user_shard_directory"
+
+    uuid: Mapped[str] = mapped_column(String, primary_key=True)
+    shard: Mapped[int] = mapped_column(Integer, nullable=False)
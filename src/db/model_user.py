@@ -1,6 +1,7 @@
 import uuid
+from datetime import datetime
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-from sqlalchemy import Boolean, Enum, String, false
+from sqlalchemy import Boolean, DateTime, Integer, String, false
 
 from src.db.roles import UserRole
 
@@ -12,7 +13,10 @@ class Base(DeclarativeBase):
 class User(Base):
     """Модель пользователя.
 
-    Содержит поля идентификатора, UUID, ФИО, email, пароль, роль и статус.
+    Содержит поля идентификатора, UUID, ФИО, email, пароль, роль и статус,
+    а также данные активности, которые пишет `ActivityTracker`.
+    `deactivated_at` – время мягкого удаления, от него отсчитывается срок
+    хранения до фоновой очистки (`UserPurger`).
     """
 
     __tablename__ = "users"
@@ -28,3 +32,11 @@ class User(Base):
     password: Mapped[str] = mapped_column(String(length=255), nullable=False)
     role: Mapped[str] = mapped_column(nullable=false, default=UserRole.SIMPLE_USER)
     is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    deactivated_at: Mapped[datetime | None] = mapped_column(
+        DateTime, nullable=True, index=True
+    )
+    last_login_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    last_seen_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    failed_login_attempts: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
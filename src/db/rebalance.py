@@ -0,0 +1,156 @@
+"""Офлайн-перераспределение пользователей при изменении числа шардов.
+
+Запускается при остановленном сервисе:
+
+    python -m src.db.rebalance --from-shards 1 --to-shards 4
+
+Пользователи, чей шард по хешу email меняется, переносятся пачками
+в новый шард (с пересборкой поискового индекса) и удаляются из старого.
+Затем справочник «UUID → шард» в основной БД строится заново. После
+завершения сервис запускается с `USER_SHARDS`, равным `--to-shards`.
+
+Копирование идемпотентно (`INSERT OR IGNORE`), а из старого шарда удаляются
+только строки, которые уже есть в новом, поэтому прерванный запуск
+достаточно повторить с теми же аргументами: пользователи, скопированные,
+но не удалённые, будут удалены, а справочник построен заново.
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from src.db.engine import async_run_db, engine
+from src.db.model_shard import ShardDirectoryEntry
+from src.db.model_user import User
+from src.db.shards import shard_for_email, shard_url
+from src.db.user_search import create_user_search_index, users_fts
+
+BATCH_SIZE = 1000
+
+
+async def _prepare(target: AsyncEngine) -> None:
+    async with target.begin() as conn:
+        await conn.run_sync(User.metadata.create_all, tables=[User.__table__])
+        await conn.run_sync(create_user_search_index)
+
+
+async def rebalance(from_shards: int, to_shards: int) -> dict[int, int]:
+    """Переносит пользователей между шардами и возвращает число пользователей в каждом."""
+    engines: dict[str, AsyncEngine] = {}
+
+    def get_engine(url: str) -> AsyncEngine:
+        if url not in engines:
+            engines[url] = create_async_engine(url)
+        return engines[url]
+
+    targets = [get_engine(shard_url(n, to_shards)) for n in range(to_shards)]
+    for target in targets:
+        await _prepare(target)
+
+    columns = [column for column in User.__table__.columns if column.name != "id"]
+    for n in range(from_shards):
+        source_url = shard_url(n, from_shards)
+        source = get_engine(source_url)
+        after = 0
+        while True:
+            async with source.connect() as conn:
+                rows = (
+                    (
+                        await conn.execute(
+                            select(User.__table__)
+                            .where(User.id > after)
+                            .order_by(User.id)
+                            .limit(BATCH_SIZE)
+                        )
+                    )
+                    .mappings()
+                    .all()
+                )
+            if not rows:
+                break
+            after = rows[-1]["id"]
+
+            moves: dict[int, list] = {}
+            for row in rows:
+                target = shard_for_email(row["email"], to_shards)
+                if shard_url(target, to_shards) != source_url:
+                    moves.setdefault(target, []).append(row)
+
+            for target, moved in moves.items():
+                uuids = [row["uuid"] for row in moved]
+                async with targets[target].begin() as conn:
+                    await conn.execute(
+                        insert(User.__table__).prefix_with("OR IGNORE"),
+                        [
+                            {column.name: row[column.name] for column in columns}
+                            for row in moved
+                        ],
+                    )
+                    copied = set(
+                        (
+                            await conn.execute(
+                                select(User.uuid).where(User.uuid.in_(uuids))
+                            )
+                        )
+                        .scalars()
+                        .all()
+                    )
+                ids = [row["id"] for row in moved if row["uuid"] in copied]
+                if not ids:
+                    continue
+                async with source.begin() as conn:
+                    await conn.execute(delete(User.__table__).where(User.id.in_(ids)))
+                    await conn.execute(
+                        delete(users_fts).where(users_fts.c.rowid.in_(ids))
+                    )
+
+    # идентификаторы перенесённых строк новые, поэтому индекс поиска
+    # в целевых шардах пересобирается один раз после переноса
+    for target in targets:
+        async with target.begin() as conn:
+            await conn.run_sync(create_user_search_index)
+
+    counts: dict[int, int] = {}
+    async with engine.begin() as main:
+        await main.execute(delete(ShardDirectoryEntry))
+        if to_shards > 1:
+            for n, target in enumerate(targets):
+                async with target.connect() as conn:
+                    uuids = (await conn.execute(select(User.uuid))).scalars().all()
+                for start in range(0, len(uuids), BATCH_SIZE):
+                    await main.execute(
+                        insert(ShardDirectoryEntry),
+                        [
+                            {"uuid": uuid, "shard": n}
+                            for uuid in uuids[start : start + BATCH_SIZE]
+                        ],
+                    )
+                counts[n] = len(uuids)
+        else:
+            async with targets[0].connect() as conn:
+                counts[0] = (
+                    await conn.execute(select(func.count()).select_from(User))
+                ).scalar_one()
+
+    for target in engines.values():
+        await target.dispose()
+    return counts
+
+
+async def _main(args: argparse.Namespace) -> None:
+    await async_run_db()
+    counts = await rebalance(args.from_shards, args.to_shards)
+    await engine.dispose()
+    for n, count in sorted(counts.items()):
+        print(f"shard {n}: {count} users")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Перераспределение пользователей по шардам"
+    )
+    parser.add_argument("--from-shards", type=int, required=True)
+    parser.add_argument("--to-shards", type=int, required=True)
+    asyncio.run(_main(parser.parse_args()))
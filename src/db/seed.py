@@ -0,0 +1,101 @@
+"""Наполнение каталога данными.
+
+При старте приложения в пустой каталог кладутся демонстрационные товары
+и заказы. Для нагрузочного тестирования каталог можно наполнить большим
+объёмом синтетических данных:
+
+    python -m src.db.seed --products 100000 --customers 50000 --orders 1000000
+
+Запись идёт через `CatalogService`, поэтому кэш ответов каталога в этом
+процессе сбрасывается после коммита, а запущенный сервис замечает новые
+данные по состоянию таблиц.
+"""
+
+import argparse
+import asyncio
+import random
+
+from src.api.services.catalog import CatalogService
+from src.db.engine import async_run_db, engine, get_async_session
+from src.db.uow import UnitOfWork
+from src.infra.repositories.catalog import CustomerRepository, ProductRepository
+
+BATCH_SIZE = 5000
+
+DEMO_PRODUCTS = [
+    {"id": 1, "name": "Keyboard", "price": 49.99},
+    {"id": 2, "name": "Mouse", "price": 19.99},
+]
+
+DEMO_ORDERS = [
+    {"id": 1, "product_id": 1, "quantity": 2},
+    {"id": 2, "product_id": 2, "quantity": 1},
+]
+
+
+async def seed_catalog() -> None:
+    """Добавляет демонстрационные товары и заказы, если каталог пуст."""
+    async with UnitOfWork(get_async_session) as uow:
+        if await ProductRepository(session=uow.session).count():
+            return
+        service = CatalogService(uow)
+        await service.add_products(DEMO_PRODUCTS)
+        await service.add_orders(DEMO_ORDERS)
+
+
+async def generate_catalog(products: int, customers: int, orders: int) -> None:
+    """Добавляет в каталог синтетические данные пачками по `BATCH_SIZE`."""
+    async with UnitOfWork(get_async_session) as uow:
+        first_product = await ProductRepository(session=uow.session).count() + 1
+        first_customer = await CustomerRepository(session=uow.session).count() + 1
+
+    for start in range(0, products, BATCH_SIZE):
+        rows = [
+            {"name": f"Product {first_product + i}", "price": round(random.uniform(1, 1000), 2)}
+            for i in range(start, min(start + BATCH_SIZE, products))
+        ]
+        async with UnitOfWork(get_async_session) as uow:
+            await CatalogService(uow).add_products(rows)
+
+    for start in range(0, customers, BATCH_SIZE):
+        rows = [
+            {
+                "email": f"customer{first_customer + i}@example.com",
+                "full_name": f"Customer {first_customer + i}",
+            }
+            for i in range(start, min(start + BATCH_SIZE, customers))
+        ]
+        async with UnitOfWork(get_async_session) as uow:
+            await CatalogService(uow).add_customers(rows)
+
+    async with UnitOfWork(get_async_session) as uow:
+        product_count = await ProductRepository(session=uow.session).count()
+        customer_count = await CustomerRepository(session=uow.session).count()
+    if not product_count:
+        return
+
+    for start in range(0, orders, BATCH_SIZE):
+        rows = [
+            {
+                "product_id": random.randint(1, product_count),
+                "customer_id": random.randint(1, customer_count) if customer_count else None,
+                "quantity": random.randint(1, 10),
+            }
+            for _ in range(start, min(start + BATCH_SIZE, orders))
+        ]
+        async with UnitOfWork(get_async_session) as uow:
+            await CatalogService(uow).add_orders(rows)
+
+
+async def _main(args: argparse.Namespace) -> None:
+    await async_run_db()
+    await generate_catalog(args.products, args.customers, args.orders)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Генерация данных каталога")
+    parser.add_argument("--products", type=int, default=0)
+    parser.add_argument("--customers", type=int, default=0)
+    parser.add_argument("--orders", type=int, default=0)
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,131 @@
+import hashlib
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from src.config import settings
+from src.db.model_archive import ArchivedUser
+from src.db.model_shard import ShardDirectoryEntry
+from src.db.model_user import User
+from src.db.user_search import create_user_search_index
+from src.db.vacuum import enable_incremental_vacuum
+
+
+def normalize_email(email: str) -> str:
+    """Приводит email к виду, по которому вычисляется шард."""
+    return email.strip().lower()
+
+
+def shard_for_email(email: str, shard_count: int) -> int:
+    """Возвращает номер шарда для email (стабильный хеш, не зависит от процесса)."""
+    digest = hashlib.blake2b(normalize_email(email).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shard_count
+
+
+def shard_url(n: int, shard_count: int) -> str:
+    """Возвращает URL БД шарда.
+
+    При одном шарде пользователи живут в основной БД.
+    """
+    if shard_count == 1:
+        return settings.DATABASE_URL
+    return settings.USER_SHARD_URL.format(n=n)
+
+
+class ShardSet:
+    """Набор БД шардов пользователей: движки и фабрики сессий.
+
+    При одном шарде движки не создаются: пользователи обслуживаются
+    основным движком и обычным `UserRepository`.
+    """
+
+    def __init__(self, count: int):
+        self.count = count
+        self.engines: list[AsyncEngine] = (
+            [create_async_engine(shard_url(n, count)) for n in range(count)]
+            if count > 1
+            else []
+        )
+        self._sessionmakers = [
+            async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+            for engine in self.engines
+        ]
+
+    @property
+    def enabled(self) -> bool:
+        """Включён ли шардированный режим (больше одного шарда)."""
+        return self.count > 1
+
+    def shard_for_email(self, email: str) -> int:
+        """Возвращает номер шарда для email."""
+        return shard_for_email(email, self.count)
+
+    def session(self, n: int) -> AsyncSession:
+        """Возвращает новую сессию БД шарда `n`."""
+        return self._sessionmakers[n]()
+
+    async def create_all(self, sync_search_index: bool = True) -> None:
+        """Создаёт таблицы пользователей, архива и поисковый индекс в каждом шарде."""
+        for engine in self.engines:
+            async with engine.begin() as conn:
+                await conn.run_sync(enable_incremental_vacuum)
+                await conn.run_sync(
+                    User.metadata.create_all,
+                    tables=[User.__table__, ArchivedUser.__table__],
+                )
+                await conn.run_sync(create_user_search_index, sync_search_index)
+
+    async def dispose(self) -> None:
+        """Закрывает пулы соединений шардов."""
+        for engine in self.engines:
+            await engine.dispose()
+
+
+class ShardDirectory:
+    """Справочник «UUID → шард» в памяти с сохранением в основную БД.
+
+    Читается целиком при старте; изменения пишутся в транзакцию
+    `UnitOfWork` вызывающего кода.
+    """
+
+    def __init__(self):
+        self._entries: dict[str, int] = {}
+
+    def get(self, uuid: str) -> int | None:
+        """Возвращает номер шарда пользователя или None."""
+        return self._entries.get(uuid)
+
+    async def load(self, session: AsyncSession) -> None:
+        """Загружает справочник из БД."""
+        result = await session.execute(select(ShardDirectoryEntry))
+        self._entries = {entry.uuid: entry.shard for entry in result.scalars()}
+
+    async def put(self, session: AsyncSession, uuid: str, shard: int) -> None:
+        """Добавляет пользователя в справочник."""
+        await session.execute(
+            insert(ShardDirectoryEntry).values(uuid=uuid, shard=shard)
+        )
+        self._entries[uuid] = shard
+
+    async def remove(self, session: AsyncSession, uuid: str) -> None:
+        """Удаляет пользователя из справочника."""
+        await self.remove_many(session, [uuid])
+
+    async def remove_many(self, session: AsyncSession, uuids: list[str]) -> None:
+        """Удаляет пользователей из справочника одним запросом."""
+        if not uuids:
+            return
+        await session.execute(
+            delete(ShardDirectoryEntry).where(ShardDirectoryEntry.uuid.in_(uuids))
+        )
+        for uuid in uuids:
+            self._entries.pop(uuid, None)
+
+
+user_shards = ShardSet(settings.USER_SHARDS)
+shard_directory = ShardDirectory()
@@ -1,25 +1,49 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Callable
 
+from src.db.shards import user_shards
+
 
 class UnitOfWork:
     """Единица работы (Unit of Work) для управления транзакцией.
 
     Создаёт сессию при входе в контекст, коммитит при успехе
-    и делает откат при ошибке, затем закрывает сессию.
+    и делает откат при ошибке, затем закрывает сессию. Сессии шардов
+    пользователей открываются по требованию (`shard_session`) и
+    завершаются вместе с основной.
     """
 
     def __init__(self, session_factory: callable):
         self.session_factory = session_factory
         self.session: AsyncSession | None = None
+        self._after_commit: list[Callable[[], None]] = []
+        self._shard_sessions: dict[int, AsyncSession] = {}
+
+    def shard_session(self, n: int) -> AsyncSession:
+        """Возвращает сессию шарда `n`, открывая её при первом обращении."""
+        if n not in self._shard_sessions:
+            self._shard_sessions[n] = user_shards.session(n)
+        return self._shard_sessions[n]
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Регистрирует колбэк, который выполнится после успешного коммита."""
+        self._after_commit.append(callback)
 
     async def __aenter__(self):
         self.session = self.session_factory()  # создаём сессию
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if exc_type:
-            await self.session.rollback()
-        else:
-            await self.session.commit()
-        await self.session.close()
+        sessions = [*self._shard_sessions.values(), self.session]
+        try:
+            if exc_type:
+                for session in sessions:
+                    await session.rollback()
+            else:
+                for session in sessions:
+                    await session.commit()
+                for callback in self._after_commit:
+                    callback()
+        finally:
+            for session in sessions:
+                await session.close()
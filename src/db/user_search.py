@@ -0,0 +1,134 @@
+import math
+import re
+import unicodedata
+
+from sqlalchemy import Connection, column, table, text
+
+USERS_FTS = "users_fts"
+# Словарь индекса (fts5vocab): число вхождений каждого терма, для средней длины строки
+USERS_FTS_VOCAB = "users_fts_vocab"
+INDEXED_FIELDS = ("name", "last_name", "surname", "email")
+
+# Лёгкое описание FTS5-таблицы для INSERT/DELETE из репозитория.
+# В Base.metadata она не входит: create_all не умеет создавать виртуальные таблицы.
+users_fts = table(
+    USERS_FTS, column("rowid"), *(column(name) for name in INDEXED_FIELDS)
+)
+
+# Параметры функции bm25() FTS5.
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def create_user_search_index(connection: Connection, sync: bool = True) -> None:
+    """Создаёт FTS5-индекс пользователей и (если `sync`) дозаполняет его.
+
+    Вызывается через `run_sync` после `create_all`.
+    """
+    connection.execute(
+        text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {USERS_FTS} "
+            f"USING fts5({', '.join(INDEXED_FIELDS)}, "
+            "tokenize='unicode61 remove_diacritics 2')"
+        )
+    )
+    connection.execute(
+        text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {USERS_FTS_VOCAB} "
+            f"USING fts5vocab({USERS_FTS}, 'row')"
+        )
+    )
+    if sync:
+        sync_user_search_index(connection)
+
+
+def sync_user_search_index(connection: Connection) -> None:
+    """Пересобирает FTS5-индекс, если число строк в нём отличается от `users`.
+
+    Требует полного прохода по обеим таблицам, поэтому при быстром старте
+    выполняется в фоне после готовности сервиса.
+    """
+    indexed = connection.execute(text(f"SELECT count(*) FROM {USERS_FTS}")).scalar_one()
+    total = connection.execute(text("SELECT count(*) FROM users")).scalar_one()
+    if indexed != total:
+        connection.execute(text(f"DELETE FROM {USERS_FTS}"))
+        connection.execute(
+            text(
+                f"INSERT INTO {USERS_FTS}(rowid, {', '.join(INDEXED_FIELDS)}) "
+                f"SELECT id, {', '.join(INDEXED_FIELDS)} FROM users"
+            )
+        )
+
+
+def search_terms(query: str) -> list[str]:
+    """Разбивает поисковую строку на термы."""
+    return re.findall(r"\w+", query)
+
+
+def match_expression(terms: list[str]) -> str:
+    """Собирает MATCH-выражение: все термы как префиксы."""
+    return " AND ".join(f'"{term}"*' for term in terms)
+
+
+def _fold(char: str) -> str:
+    """Снимает диакритику с латинской буквы («é» → «e»); FTS5 не трогает
+    остальные алфавиты («й» и «ё» остаются собой)."""
+    base = unicodedata.normalize("NFD", char)[0]
+    return base if base.isascii() else char
+
+
+def tokenize(value: str) -> list[str]:
+    """Делит текст на токены так же, как `unicode61 remove_diacritics 2`.
+
+    Токены – непрерывные последовательности букв и цифр в нижнем регистре,
+    у латинских букв без диакритики.
+    """
+    return [
+        "".join(_fold(char) for char in token.lower())
+        for token in re.findall(r"[^\W_]+", value)
+    ]
+
+
+def _phrase_hits(tokens: list[str], phrase: list[str]) -> int:
+    """Считает вхождения фразы, последний токен которой – префикс."""
+    *head, last = phrase
+    size = len(phrase)
+    return sum(
+        tokens[i : i + size - 1] == head and tokens[i + size - 1].startswith(last)
+        for i in range(len(tokens) - size + 1)
+    )
+
+
+def bm25(
+    values: list[str],
+    terms: list[str],
+    rows: int,
+    tokens: int,
+    hits: list[int],
+) -> float:
+    """Вычисляет bm25 строки по формуле FTS5 (меньше – релевантнее).
+
+    `values` – индексируемые поля строки, `rows` и `tokens` – число строк и
+    токенов в индексе, `hits[i]` – число строк, содержащих `terms[i]`.
+    Статистика передаётся явно, поэтому ранг можно считать по всем шардам
+    сразу, а не по корпусу одного шарда.
+    """
+    columns = [tokenize(value or "") for value in values]
+    size = sum(len(column) for column in columns)
+    average = tokens / rows if rows else 1.0
+    score = 0.0
+    for term, term_hits in zip(terms, hits):
+        phrase = tokenize(term)
+        if not phrase:
+            continue
+        idf = math.log((rows - term_hits + 0.5) / (term_hits + 0.5))
+        if idf <= 0:
+            idf = 1e-6
+        frequency = sum(_phrase_hits(column, phrase) for column in columns)
+        score += idf * (
+            frequency
+            * (BM25_K1 + 1)
+            / (frequency + BM25_K1 * (1 - BM25_B + BM25_B * size / average))
+        )
+    return -score
+
@@ -0,0 +1,30 @@
+from sqlalchemy import Connection
+
+
+def enable_incremental_vacuum(connection: Connection) -> None:
+    """Включает `auto_vacuum=INCREMENTAL` для SQLite.
+
+    Вызывается через `run_sync` до `create_all`. Режим применяется только
+    к новой (пустой) БД; существующую нужно один раз перестроить `VACUUM`.
+    """
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+
+
+def incremental_vacuum(connection: Connection, pages: int) -> tuple[int, int] | None:
+    """Возвращает в ОС до `pages` свободных страниц БД.
+
+    Возвращает пару (освобождено, осталось свободных страниц) или None,
+    если инкрементальная очистка для БД недоступна.
+    """
+    if connection.dialect.name != "sqlite":
+        return None
+    mode = connection.exec_driver_sql("PRAGMA auto_vacuum").scalar_one()
+    if mode != 2:  # 2 – INCREMENTAL
+        return None
+    free = connection.exec_driver_sql("PRAGMA freelist_count").scalar_one()
+    # драйвер выполняет один шаг PRAGMA, а каждый шаг освобождает одну страницу
+    for _ in range(min(pages, free)):
+        connection.exec_driver_sql("PRAGMA incremental_vacuum(1)")
+    remaining = connection.exec_driver_sql("PRAGMA freelist_count").scalar_one()
+    return free - remaining, remaining
@@ -0,0 +1,119 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from src.config import settings
+from src.db.engine import get_async_session
+from src.db.uow import UnitOfWork
+from src.infra.repositories.sharded_user import get_user_repository_class
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PendingActivity:
+    """Ещё не записанная в БД активность одного пользователя."""
+
+    last_login_at: datetime | None = None
+    last_seen_at: datetime | None = None
+    reset_failed: bool = False
+    failed: int = 0
+
+
+@dataclass
+class ActivityTracker:
+    """Учёт активности пользователей с объединением записей.
+
+    Вход, неудачный вход и каждый аутентифицированный запрос только
+    обновляют запись пользователя в словаре в памяти. Фоновая задача раз
+    в `flush_interval` секунд (или раньше, если накопилось `max_pending`
+    пользователей) записывает все изменения одним пакетным UPDATE, так что
+    сколько бы запросов ни сделал пользователь, в БД уходит одна строка.
+    """
+
+    flush_interval: float = settings.ACTIVITY_FLUSH_SECONDS
+    max_pending: int = settings.ACTIVITY_MAX_PENDING
+    _pending: dict[str, PendingActivity] = field(default_factory=dict)
+    _wakeup: asyncio.Event | None = None
+    _task: asyncio.Task | None = None
+    _stopping: bool = False
+
+    def login(self, email: str) -> None:
+        """Отмечает успешный вход: обновляет время и обнуляет неудачные попытки."""
+        activity = self._get(email)
+        activity.last_login_at = activity.last_seen_at = datetime.now()
+        activity.reset_failed = True
+        activity.failed = 0
+
+    def login_failed(self, email: str) -> None:
+        """Отмечает неудачную попытку входа существующего пользователя."""
+        self._get(email).failed += 1
+
+    def seen(self, email: str) -> None:
+        """Отмечает аутентифицированный запрос пользователя."""
+        self._get(email).last_seen_at = datetime.now()
+
+    def pending(self, email: str) -> PendingActivity | None:
+        """Возвращает ещё не записанную активность пользователя."""
+        return self._pending.get(email)
+
+    async def start(self) -> None:
+        """Запускает периодическую запись активности."""
+        if self._task is None:
+            self._stopping = False
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Останавливает запись и сбрасывает накопленную активность."""
+        if self._task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Записывает накопленную активность в БД одним пакетом."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        rows = [
+            {
+                "email": email,
+                "last_login_at": activity.last_login_at,
+                "last_seen_at": activity.last_seen_at,
+                "reset_failed": activity.reset_failed,
+                "failed": activity.failed,
+            }
+            for email, activity in pending.items()
+        ]
+        try:
+            async with UnitOfWork(get_async_session) as uow:
+                repository = get_user_repository_class().from_uow(uow)
+                await repository.apply_activity(rows)
+        except Exception:
+            logger.exception(
+                "Не удалось записать активность %d пользователей", len(rows)
+            )
+
+    def _get(self, email: str) -> PendingActivity:
+        activity = self._pending.get(email)
+        if activity is None:
+            activity = self._pending[email] = PendingActivity()
+            if self._wakeup is not None and len(self._pending) >= self.max_pending:
+                self._wakeup.set()
+        return activity
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+
+activity_tracker = ActivityTracker()
@@ -0,0 +1,167 @@
+import asyncio
+import json
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from src.config import settings
+from src.db.engine import get_async_session
+from src.db.model_audit import AuditAction
+from src.db.uow import UnitOfWork
+from src.infra.repositories.audit import AuditRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AuditStats:
+    """Счётчики работы журнала аудита."""
+
+    emitted: int = 0
+    written: int = 0
+    dropped: int = 0
+    retried: int = 0
+    fallback: int = 0
+    failed: int = 0
+    batches: int = 0
+
+
+@dataclass
+class AuditLog:
+    """Асинхронный журнал аудита с пакетной записью.
+
+    `emit` только кладёт событие в ограниченную очередь в памяти и не
+    обращается к БД. Фоновая задача просыпается, как только набралось
+    `batch_size` событий, и не реже раза в `flush_interval` секунд;
+    проснувшись, она пишет все накопленные события пачками не больше
+    `batch_size`, каждую одним executemany INSERT.
+
+    Пачка, которую не удалось записать, повторяется на следующем цикле
+    (до `max_retries` повторов), а затем дописывается в файл
+    `fallback_path` (JSON Lines), откуда её можно загрузить вручную.
+    События теряются (`stats.failed`), только если не удалась и эта запись.
+
+    При переполнении очереди действует политика `overflow`:
+    `drop_oldest` вытесняет самое старое событие, `drop_new` отбрасывает
+    новое. Потерянные события учитываются в `stats.dropped`.
+    """
+
+    max_size: int = settings.AUDIT_QUEUE_SIZE
+    batch_size: int = settings.AUDIT_BATCH_SIZE
+    flush_interval: float = settings.AUDIT_FLUSH_SECONDS
+    overflow: str = settings.AUDIT_OVERFLOW
+    max_retries: int = settings.AUDIT_MAX_RETRIES
+    fallback_path: str = settings.AUDIT_FALLBACK_PATH
+    stats: AuditStats = field(default_factory=AuditStats)
+    _queue: deque = field(default_factory=deque)
+    _retry: list[dict] = field(default_factory=list)
+    _attempts: int = 0
+    _wakeup: asyncio.Event | None = None
+    _task: asyncio.Task | None = None
+    _stopping: bool = False
+
+    def emit(
+        self,
+        action: AuditAction,
+        email: str,
+        actor: str | None = None,
+        details: str | None = None,
+    ) -> None:
+        """Ставит событие в очередь на запись (без ожидания и без I/O)."""
+        if len(self._queue) >= self.max_size:
+            self.stats.dropped += 1
+            if self.overflow == "drop_new":
+                return
+            self._queue.popleft()
+        self._queue.append(
+            {
+                "created_at": datetime.now(),
+                "action": action.value,
+                "email": email,
+                "actor": actor,
+                "details": details,
+            }
+        )
+        self.stats.emitted += 1
+        if self._wakeup is not None and len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+
+    async def start(self) -> None:
+        """Запускает фоновую запись событий."""
+        if self._task is None:
+            self._stopping = False
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Останавливает фоновую запись и сбрасывает оставшиеся события."""
+        if self._task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        while self._queue or self._retry:
+            await self.flush()
+
+    async def flush(self) -> bool:
+        """Записывает в БД одну пачку событий: сначала неудавшуюся, затем из очереди.
+
+        Возвращает False, если запись не удалась и пачка оставлена для повтора.
+        """
+        if self._retry:
+            batch, self._retry = self._retry, []
+        else:
+            count = min(len(self._queue), self.batch_size)
+            batch = [self._queue.popleft() for _ in range(count)]
+        if not batch:
+            return True
+        try:
+            async with UnitOfWork(get_async_session) as uow:
+                await AuditRepository(session=uow.session).add_many(batch)
+        except Exception:
+            logger.exception("Не удалось записать %d событий аудита", len(batch))
+            if self._attempts < self.max_retries:
+                self._attempts += 1
+                self._retry = batch
+                self.stats.retried += len(batch)
+                return False
+            await self._write_fallback(batch)
+        else:
+            self.stats.written += len(batch)
+            self.stats.batches += 1
+        self._attempts = 0
+        return True
+
+    async def _write_fallback(self, batch: list[dict]) -> None:
+        """Дописывает пачку в резервный файл; при неудаче события теряются."""
+        lines = "".join(json.dumps(event, default=str) + "\n" for event in batch)
+
+        def write() -> None:
+            with open(self.fallback_path, "a", encoding="utf-8") as file:
+                file.write(lines)
+
+        try:
+            await asyncio.to_thread(write)
+            self.stats.fallback += len(batch)
+        except Exception:
+            self.stats.failed += len(batch)
+            logger.exception(
+                "Потеряно %d событий аудита: не удалась и запись в %s",
+                len(batch),
+                self.fallback_path,
+            )
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            # после неудачной записи повтор откладывается до следующего цикла
+            while (self._retry or self._queue) and await self.flush():
+                pass
+
+
+audit_log = AuditLog()
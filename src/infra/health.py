@@ -0,0 +1,204 @@
+import asyncio
+import contextlib
+from collections import Counter
+from dataclasses import dataclass
+
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.auth.breached import breached_passwords
+from src.auth.hashing import password_hasher
+from src.config import settings
+from src.db.engine import engine
+from src.db.model_user import Base
+from src.db.shards import user_shards
+from src.db.user_search import USERS_FTS
+
+# Проверки, провал которых означает работу с урезанной защитой, а не
+# неготовность: сервис остаётся в балансировке, но проба сообщает о проблеме.
+DEGRADED_CHECKS = ("breached_passwords",)
+
+
+@dataclass
+class LoopMonitor:
+    """Измеряет задержку цикла событий фоновой задачей-«пульсом».
+
+    Задача засыпает на `interval` секунд; насколько позже она проснулась,
+    настолько цикл был занят чужой синхронной работой.
+    """
+
+    interval: float = settings.HEALTH_HEARTBEAT_SECONDS
+    lag: float = 0.0
+    max_lag: float = 0.0
+    _task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        """Запускает задачу-пульс."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Останавливает задачу-пульс."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lag = max(0.0, loop.time() - expected)
+            self.max_lag = max(self.max_lag, self.lag)
+
+
+class PoolMonitor:
+    """Счётчики пулов соединений SQLAlchemy.
+
+    Кроме текущего состояния пула считает выдачи соединений и выдачи,
+    после которых пул исчерпан (следующий запрос соединения будет ждать).
+    """
+
+    def __init__(self):
+        self._engines: dict[str, AsyncEngine] = {}
+        self._checkouts: Counter[str] = Counter()
+        self._exhausted: Counter[str] = Counter()
+
+    def watch(self, name: str, target: AsyncEngine) -> None:
+        """Подключает счётчики к пулу движка."""
+        if name in self._engines:
+            return
+        self._engines[name] = target
+        pool = target.sync_engine.pool
+
+        def on_checkout(*_) -> None:
+            self._checkouts[name] += 1
+            capacity = pool.size() + max(pool._max_overflow, 0)
+            if pool.checkedout() >= capacity:
+                self._exhausted[name] += 1
+
+        event.listen(pool, "checkout", on_checkout)
+
+    def stats(self) -> dict[str, dict]:
+        """Возвращает состояние и счётчики каждого пула."""
+        result = {}
+        for name, target in self._engines.items():
+            pool = target.sync_engine.pool
+            result[name] = {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": max(pool._max_overflow, 0),
+                "checkouts": self._checkouts[name],
+                "exhausted": self._exhausted[name],
+            }
+        return result
+
+    def saturated(self) -> list[str]:
+        """Возвращает имена пулов, у которых сейчас заняты все соединения."""
+        return [
+            name
+            for name, stats in self.stats().items()
+            if stats["checked_out"] >= stats["size"] + stats["max_overflow"]
+        ]
+
+
+class InFlightRequests:
+    """Число выполняющихся запросов по маршрутам."""
+
+    def __init__(self):
+        self._counts: Counter[str] = Counter()
+
+    def enter(self, route: str) -> None:
+        """Отмечает начало запроса к маршруту."""
+        self._counts[route] += 1
+
+    def exit(self, route: str) -> None:
+        """Отмечает завершение запроса к маршруту."""
+        self._counts[route] -= 1
+        if self._counts[route] <= 0:
+            del self._counts[route]
+
+    def snapshot(self) -> dict[str, int]:
+        """Возвращает маршруты с ненулевым числом запросов."""
+        return dict(self._counts)
+
+
+class ReadinessProbe:
+    """Проверка готовности: доступность БД, схема и отсутствие насыщения.
+
+    Схема проверяется до первого успешного результата: появившиеся
+    таблицы уже не исчезают, поэтому дальше проверка стоит одного `SELECT 1`.
+    Проверки из `DEGRADED_CHECKS` попадают в результаты и ошибки, но на
+    готовность не влияют.
+    """
+
+    def __init__(self):
+        self._schema_ready = False
+
+    async def check(self) -> tuple[bool, dict[str, bool], list[str]]:
+        """Возвращает (готов ли сервис, результаты проверок, описания проблем)."""
+        errors: list[str] = []
+        checks = dict.fromkeys(
+            ("database", "schema", "event_loop", "hashing", "database_pool"), True
+        )
+        targets = {"main": engine}
+        targets.update(
+            {f"shard_{n}": target for n, target in enumerate(user_shards.engines)}
+        )
+        try:
+            async with asyncio.timeout(settings.HEALTH_DB_TIMEOUT_SECONDS):
+                for name, target in targets.items():
+                    async with target.connect() as conn:
+                        await conn.exec_driver_sql("SELECT 1")
+                        if not self._schema_ready:
+                            missing = await conn.run_sync(
+                                _missing_tables, _required_tables(name)
+                            )
+                            if missing:
+                                checks["schema"] = False
+                                errors.append(
+                                    f"{name}: нет таблиц {', '.join(sorted(missing))}"
+                                )
+        except Exception as e:
+            checks["database"] = False
+            errors.append(f"БД недоступна: {e!r}")
+        if checks["database"] and checks["schema"]:
+            self._schema_ready = True
+
+        if loop_monitor.lag * 1000 > settings.HEALTH_MAX_LOOP_LAG_MS:
+            checks["event_loop"] = False
+            errors.append(f"задержка цикла событий {loop_monitor.lag * 1000:.0f} мс")
+        if password_hasher.queue_depth > settings.HEALTH_MAX_HASH_QUEUE:
+            checks["hashing"] = False
+            errors.append(f"очередь хеширования {password_hasher.queue_depth}")
+        saturated = pool_monitor.saturated()
+        if saturated:
+            checks["database_pool"] = False
+            errors.append(f"исчерпаны пулы соединений: {', '.join(saturated)}")
+        ready = all(checks.values())
+
+        checks["breached_passwords"] = breached_passwords.available
+        if not breached_passwords.available:
+            errors.append(
+                f"проверка утёкших паролей выключена: {breached_passwords.error}"
+            )
+        return ready, checks, errors
+
+
+def _required_tables(name: str) -> set[str]:
+    if name == "main":
+        return {*Base.metadata.tables, USERS_FTS}
+    return {"users", "users_archive", USERS_FTS}
+
+
+def _missing_tables(connection, required: set[str]) -> set[str]:
+    return required - set(inspect(connection).get_table_names())
+
+
+loop_monitor = LoopMonitor()
+pool_monitor = PoolMonitor()
+in_flight = InFlightRequests()
+readiness = ReadinessProbe()
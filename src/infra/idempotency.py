@@ -0,0 +1,152 @@
+import asyncio
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from src.config import settings
+from src.db.engine import get_async_session
+from src.db.uow import UnitOfWork
+from src.infra.repositories.idempotency import IdempotencyRepository
+
+
+@dataclass
+class StoredResponse:
+    """Ответ, сохранённый для повторной отдачи по ключу идемпотентности."""
+
+    fingerprint: str
+    status_code: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+    expires_at: datetime
+
+    def row(self, key: str) -> dict:
+        """Возвращает строку для `IdempotencyRepository.add_many`."""
+        return {
+            "key": key,
+            "fingerprint": self.fingerprint,
+            "status_code": self.status_code,
+            "headers": json.dumps(
+                [
+                    [name.decode("latin-1"), value.decode("latin-1")]
+                    for name, value in self.headers
+                ]
+            ),
+            "body": self.body,
+            "expires_at": self.expires_at,
+        }
+
+
+class IdempotencyStore:
+    """Хранилище ответов по ключам идемпотентности.
+
+    - Ответы живут `ttl` и лежат в LRU-словаре в памяти не больше `max_size`
+    - Вытесненные из памяти ответы (и все ответы при остановке) сохраняются
+      в таблицу `idempotency_keys`; при промахе по памяти ответ ищется там
+      по первичному ключу, так что видны и ответы, сохранённые другими
+      процессами
+    - Пока запрос с ключом выполняется, его повторы ждут тот же результат
+      (single-flight), а не выполняют обработчик ещё раз
+    """
+
+    def __init__(
+        self,
+        max_size: int = settings.IDEMPOTENCY_CACHE_SIZE,
+        ttl: timedelta = timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS),
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._cache: OrderedDict[str, StoredResponse] = OrderedDict()
+        self._inflight: dict[str, tuple[str, asyncio.Future]] = {}
+
+    async def load(self) -> None:
+        """Удаляет из БД просроченные ответы."""
+        async with UnitOfWork(get_async_session) as uow:
+            await IdempotencyRepository(session=uow.session).delete_expired(
+                datetime.now()
+            )
+
+    async def stop(self) -> None:
+        """Сохраняет в БД непросроченные ответы из памяти."""
+        now = datetime.now()
+        rows = [
+            stored.row(key)
+            for key, stored in self._cache.items()
+            if stored.expires_at > now
+        ]
+        self._cache.clear()
+        await self._spill(rows)
+
+    async def lookup(self, key: str) -> StoredResponse | None:
+        """Возвращает сохранённый ответ по ключу или None."""
+        now = datetime.now()
+        stored = self._cache.get(key)
+        if stored is not None:
+            if stored.expires_at > now:
+                self._cache.move_to_end(key)
+                return stored
+            del self._cache[key]
+        async with UnitOfWork(get_async_session) as uow:
+            row = await IdempotencyRepository(session=uow.session).get_one_or_none(
+                key=key
+            )
+        if row is None or row.expires_at <= now:
+            return None
+        return StoredResponse(
+            fingerprint=row.fingerprint,
+            status_code=row.status_code,
+            headers=[
+                (name.encode("latin-1"), value.encode("latin-1"))
+                for name, value in json.loads(row.headers)
+            ],
+            body=row.body,
+            expires_at=row.expires_at,
+        )
+
+    def inflight(self, key: str) -> tuple[str, asyncio.Future] | None:
+        """Возвращает (отпечаток, future) выполняющегося запроса с ключом или None."""
+        return self._inflight.get(key)
+
+    def begin(self, key: str, fingerprint: str) -> asyncio.Future:
+        """Отмечает начало выполнения запроса с ключом."""
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = (fingerprint, future)
+        return future
+
+    def end(self, key: str) -> None:
+        """Снимает отметку о выполнении запроса с ключом."""
+        self._inflight.pop(key, None)
+
+    async def save(
+        self,
+        key: str,
+        fingerprint: str,
+        status_code: int,
+        headers: list[tuple[bytes, bytes]],
+        body: bytes,
+    ) -> StoredResponse:
+        """Сохраняет ответ; вытесненные из памяти ответы пишет в БД."""
+        stored = StoredResponse(
+            fingerprint=fingerprint,
+            status_code=status_code,
+            headers=headers,
+            body=body,
+            expires_at=datetime.now() + self.ttl,
+        )
+        self._cache[key] = stored
+        self._cache.move_to_end(key)
+        evicted = []
+        while len(self._cache) > self.max_size:
+            evicted_key, evicted_response = self._cache.popitem(last=False)
+            evicted.append(evicted_response.row(evicted_key))
+        await self._spill(evicted)
+        return stored
+
+    async def _spill(self, rows: list[dict]) -> None:
+        if not rows:
+            return
+        async with UnitOfWork(get_async_session) as uow:
+            await IdempotencyRepository(session=uow.session).add_many(rows)
+
+
+idempotency_store = IdempotencyStore()
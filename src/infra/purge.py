@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from src.config import settings
+from src.db.engine import engine, get_async_session
+from src.db.model_audit import AuditAction
+from src.db.shards import user_shards
+from src.db.uow import UnitOfWork
+from src.db.vacuum import incremental_vacuum
+from src.infra.audit import audit_log
+from src.infra.repositories.sharded_user import get_user_repository_class
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PurgeStats:
+    """Прогресс и счётчики фоновой очистки."""
+
+    running: bool = False
+    runs: int = 0
+    purged: int = 0
+    stamped: int = 0
+    batches: int = 0
+    failed_runs: int = 0
+    vacuumed_pages: int = 0
+    vacuum_available: bool | None = None
+    run_pending: int = 0
+    run_purged: int = 0
+    longest_batch_seconds: float = 0.0
+    last_run_started_at: datetime | None = None
+    last_run_finished_at: datetime | None = None
+    last_error: str | None = None
+
+
+@dataclass
+class UserPurger:
+    """Фоновая очистка деактивированных пользователей.
+
+    Раз в `interval` секунд пользователи, деактивированные раньше, чем
+    `retention_days` дней назад, переносятся в `users_archive` и удаляются
+    вместе со строками поискового индекса. Каждая пачка из `batch_size`
+    пользователей – отдельная короткая транзакция, между пачками выдерживается
+    пауза `batch_pause`, поэтому блокировка записи SQLite не удерживается
+    надолго и запросы сервиса успевают выполняться. После прохода
+    освободившиеся страницы возвращаются в ОС через `PRAGMA incremental_vacuum`
+    порциями по `vacuum_pages` страниц.
+    """
+
+    interval: float = settings.PURGE_INTERVAL_SECONDS
+    retention_days: int = settings.PURGE_RETENTION_DAYS
+    batch_size: int = settings.PURGE_BATCH_SIZE
+    batch_pause: float = settings.PURGE_BATCH_PAUSE_SECONDS
+    vacuum_pages: int = settings.PURGE_VACUUM_PAGES
+    stats: PurgeStats = field(default_factory=PurgeStats)
+    _wakeup: asyncio.Event | None = None
+    _task: asyncio.Task | None = None
+    _stopping: bool = False
+
+    async def start(self) -> None:
+        """Запускает периодическую очистку (если интервал не нулевой)."""
+        if self._task is None and self.interval > 0:
+            self._stopping = False
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Останавливает очистку; текущий проход прерывается между пачками."""
+        if self._task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+
+    async def run_once(self) -> int:
+        """Выполняет один проход очистки и возвращает число удалённых пользователей."""
+        if self.stats.running:
+            return 0
+        now = datetime.now()
+        before = now - timedelta(days=self.retention_days)
+        self.stats.running = True
+        self.stats.run_purged = 0
+        self.stats.last_run_started_at = now
+        try:
+            while not self._stopping:
+                async with UnitOfWork(get_async_session) as uow:
+                    repository = get_user_repository_class().from_uow(uow)
+                    stamped = await repository.stamp_deactivated(now, self.batch_size)
+                self.stats.stamped += stamped
+                if stamped < self.batch_size:
+                    break
+                await asyncio.sleep(self.batch_pause)
+
+            async with UnitOfWork(get_async_session) as uow:
+                repository = get_user_repository_class().from_uow(uow)
+                self.stats.run_pending = await repository.count_deactivated(before)
+
+            while not self._stopping and self.stats.run_purged < self.stats.run_pending:
+                started = time.perf_counter()
+                async with UnitOfWork(get_async_session) as uow:
+                    repository = get_user_repository_class().from_uow(uow)
+                    purged = await repository.purge_deactivated(before, self.batch_size)
+                    for _, email in purged:
+                        uow.after_commit(
+                            lambda email=email: audit_log.emit(
+                                AuditAction.PURGED, email, actor="purge"
+                            )
+                        )
+                self.stats.longest_batch_seconds = max(
+                    self.stats.longest_batch_seconds, time.perf_counter() - started
+                )
+                self.stats.batches += 1
+                self.stats.run_purged += len(purged)
+                self.stats.purged += len(purged)
+                if len(purged) < self.batch_size:
+                    break
+                await asyncio.sleep(self.batch_pause)
+
+            if self.stats.run_purged:
+                await self._vacuum()
+            self.stats.runs += 1
+            self.stats.last_error = None
+        except Exception as e:
+            self.stats.failed_runs += 1
+            self.stats.last_error = str(e)
+            logger.exception("Ошибка очистки деактивированных пользователей")
+        finally:
+            self.stats.running = False
+            self.stats.last_run_finished_at = datetime.now()
+        return self.stats.run_purged
+
+    async def _vacuum(self) -> None:
+        """Порциями возвращает в ОС освободившиеся страницы БД."""
+        engines = [engine, *user_shards.engines]
+        for target in engines:
+            while not self._stopping:
+                async with target.connect() as conn:
+                    result = await conn.run_sync(incremental_vacuum, self.vacuum_pages)
+                self.stats.vacuum_available = result is not None
+                if result is None:
+                    break
+                freed, remaining = result
+                self.stats.vacuumed_pages += freed
+                if remaining == 0 or freed == 0:
+                    break
+                await asyncio.sleep(self.batch_pause)
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            if not self._stopping:
+                await self.run_once()
+
+
+user_purger = UserPurger()
@@ -0,0 +1,57 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import ClassVar, Type
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.model_audit import AuditRecord
+from src.infra.repositories.base import BaseRepository
+
+
+@dataclass
+class AuditRepository(BaseRepository):
+    """Репозиторий для модели `AuditRecord`.
+
+    Журнал только дополняется, поэтому методы `edit`/`delete` не реализованы.
+    """
+
+    model: ClassVar[Type[AuditRecord]] = AuditRecord
+    session: AsyncSession
+
+    async def get_one_or_none(self, **filter_by):
+        """Возвращает одну запись по фильтрам или None."""
+        query = select(self.model).filter_by(**filter_by)
+        result = await self.session.execute(query)
+        return result.scalars().one_or_none()
+
+    async def add_many(self, rows: list[dict]) -> None:
+        """Вставляет пачку записей одним executemany INSERT.
+
+        В отличие от многострочного `INSERT ... VALUES` число параметров
+        в запросе не зависит от размера пачки и не упирается в лимит SQLite.
+        """
+        if rows:
+            await self.session.execute(insert(self.model), rows)
+
+    async def get_page(
+        self,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        before: int | None = None,
+        limit: int = 100,
+        **filter_by,
+    ):
+        """Возвращает записи за период от новых к старым.
+
+        `before` — keyset-курсор: id последней записи предыдущей страницы.
+        """
+        query = select(self.model).filter_by(**filter_by)
+        if since is not None:
+            query = query.where(self.model.created_at >= since)
+        if until is not None:
+            query = query.where(self.model.created_at < until)
+        if before is not None:
+            query = query.where(self.model.id < before)
+        query = query.order_by(self.model.id.desc()).limit(limit)
+        result = await self.session.execute(query)
+        return result.scalars().all()
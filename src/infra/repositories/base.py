@@ -1,8 +1,8 @@
 from abc import ABC
 from dataclasses import dataclass
-from sqlalchemy.orm import Session
 from typing import ClassVar, Type
-from unittest.mock import Base
+
+from src.db.model_user import Base
 
 
 @dataclass
@@ -0,0 +1,121 @@
+from dataclasses import dataclass
+from typing import ClassVar, Type
+from pydantic import BaseModel
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.model_catalog import Customer, Order, Product
+from src.db.model_user import Base
+from src.infra.repositories.base import BaseRepository
+
+
+@dataclass
+class CatalogRepository(BaseRepository):
+    """Общий репозиторий сущностей каталога.
+
+    Помимо CRUD-методов умеет отдавать страницы по keyset-курсору:
+    `WHERE id > :after ORDER BY id LIMIT :limit` идёт по первичному ключу
+    и не деградирует на больших смещениях, в отличие от OFFSET.
+    """
+
+    model: ClassVar[Type[Base]]
+    session: AsyncSession
+
+    async def get_all(self):
+        """Возвращает все записи модели."""
+        result = await self.session.execute(select(self.model))
+        return result.scalars().all()
+
+    async def get_one_or_none(self, **filter_by):
+        """Возвращает одну запись по фильтру или None."""
+        query = select(self.model).filter_by(**filter_by)
+        result = await self.session.execute(query)
+        return result.scalars().one_or_none()
+
+    async def get_page(self, after: int | None = None, limit: int = 50, **filter_by):
+        """Возвращает до `limit` записей с `id` больше `after`, упорядоченных по `id`."""
+        query = select(self.model).filter_by(**filter_by)
+        if after is not None:
+            query = query.where(self.model.id > after)
+        query = query.order_by(self.model.id).limit(limit)
+        result = await self.session.execute(query)
+        return result.scalars().all()
+
+    async def count(self) -> int:
+        """Возвращает количество записей модели."""
+        result = await self.session.execute(select(func.count()).select_from(self.model))
+        return result.scalar_one()
+
+    async def state(self) -> tuple[int | None, int]:
+        """Возвращает (максимальный `id`, количество записей) – признак изменения таблицы."""
+        query = select(func.max(self.model.id), func.count()).select_from(self.model)
+        result = await self.session.execute(query)
+        return tuple(result.one())
+
+    async def add(self, data: BaseModel):
+        """Создаёт запись и возвращает её идентификатор."""
+        stmt = insert(self.model).values(**data.model_dump()).returning(self.model.id)
+        res = await self.session.execute(stmt)
+        return res.scalar_one()
+
+    async def add_many(self, rows: list[dict]) -> None:
+        """Вставляет пачку записей одним executemany."""
+        if rows:
+            await self.session.execute(insert(self.model), rows)
+
+    async def edit(self, data: BaseModel, exclude_unset: bool = False, **filter_by):
+        """Обновляет запись по фильтру и возвращает идентификатор."""
+        stmt = (
+            update(self.model)
+            .filter_by(**filter_by)
+            .values(**data.model_dump(exclude_unset=exclude_unset))
+            .returning(self.model.id)
+        )
+        res = await self.session.execute(stmt)
+        return res.scalar_one()
+
+    async def delete(self, **filter_by):
+        """Удаляет запись по фильтру и возвращает идентификатор."""
+        stmt = delete(self.model).filter_by(**filter_by).returning(self.model.id)
+        res = await self.session.execute(stmt)
+        return res.scalar_one()
+
+
+@dataclass
+class ProductRepository(CatalogRepository):
+    """Репозиторий для модели `Product`."""
+
+    model: ClassVar[Type[Product]] = Product
+
+
+@dataclass
+class CustomerRepository(CatalogRepository):
+    """Репозиторий для модели `Customer`."""
+
+    model: ClassVar[Type[Customer]] = Customer
+
+
+@dataclass
+class OrderRepository(CatalogRepository):
+    """Репозиторий для модели `Order`."""
+
+    model: ClassVar[Type[Order]] = Order
+
+    async def get_page_with_products(
+        self,
+        after: int | None = None,
+        limit: int = 50,
+        product_id: int | None = None,
+    ) -> list[tuple[Order, Product]]:
+        """Возвращает страницу заказов вместе с товарами одним JOIN-запросом.
+
+        При фильтре по `product_id` используется индекс `(product_id, id)`.
+        """
+        query = select(Order, Product).join(Product, Order.product_id == Product.id)
+        if product_id is not None:
+            query = query.where(Order.product_id == product_id)
+        if after is not None:
+            query = query.where(Order.id > after)
+        query = query.order_by(Order.id).limit(limit)
+        result = await self.session.execute(query)
+        return result.tuples().all()
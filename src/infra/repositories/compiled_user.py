@@ -0,0 +1,157 @@
+from collections import Counter
+from dataclasses import dataclass, field
+
+from pydantic import BaseModel
+from sqlalchemy import String, bindparam, delete, func, insert, select, update
+from sqlalchemy.orm.util import identity_key
+from sqlalchemy.orm.attributes import set_committed_value
+
+from src.db.model_user import User
+from src.db.user_search import INDEXED_FIELDS, users_fts
+from src.infra.repositories.user import UserRepository
+
+PROFILE_FIELDS = ("name", "last_name", "surname")
+
+
+def _update(where, **values):
+    return (
+        update(User)
+        .where(where)
+        .values(**values)
+        .returning(User.id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+# Заранее собранные запросы с привязанными параметрами. Объекты запросов
+# создаются один раз, поэтому SQLAlchemy не строит их и не вычисляет ключ
+# кэша компиляции при каждом вызове.
+STATEMENTS = {
+    "by_email": select(User).where(User.email == bindparam("b_email")),
+    "by_uuid": select(User).where(User.uuid == bindparam("b_uuid")),
+    "update_profile": _update(
+        User.email == bindparam("b_email"),
+        **{
+            name: func.coalesce(
+                bindparam(f"b_{name}", type_=String), getattr(User, name)
+            )
+            for name in PROFILE_FIELDS
+        },
+    ),
+    "set_role": _update(User.uuid == bindparam("b_uuid"), role=bindparam("b_role")),
+    "set_password": _update(
+        User.email == bindparam("b_email"), password=bindparam("b_password")
+    ),
+    "reindex_delete": delete(users_fts).where(users_fts.c.rowid == bindparam("b_id")),
+    "reindex_insert": insert(users_fts).from_select(
+        ["rowid", *INDEXED_FIELDS],
+        select(User.id, *(getattr(User, name) for name in INDEXED_FIELDS)).where(
+            User.id == bindparam("b_id")
+        ),
+    ),
+}
+
+
+@dataclass
+class StatementStats:
+    """Статистика заранее собранных запросов.
+
+    `hits` – выполнения по имени запроса, `misses` – вызовы методов, для
+    которых готового запроса нет (другой набор фильтров или полей), и
+    запрос строился заново.
+    """
+
+    hits: Counter[str] = field(default_factory=Counter)
+    misses: Counter[str] = field(default_factory=Counter)
+
+    def snapshot(self) -> dict:
+        """Возвращает счётчики и долю попаданий."""
+        hits, misses = sum(self.hits.values()), sum(self.misses.values())
+        return {
+            "hits": dict(self.hits),
+            "misses": dict(self.misses),
+            "hit_ratio": hits / (hits + misses) if hits + misses else 1.0,
+        }
+
+
+@dataclass
+class CompiledUserRepository(UserRepository):
+    """Репозиторий пользователей на заранее собранных запросах (`STATEMENTS`).
+
+    Поиск по email/UUID, обновление профиля, смена роли и пароля выполняются
+    готовыми запросами с привязанными параметрами; остальные вызовы
+    (и фильтры, для которых готового запроса нет) – методами `UserRepository`.
+    Изменения, сделанные готовыми UPDATE, переносятся в уже загруженные
+    в сессию объекты.
+    """
+
+    async def get_one_or_none(self, **filter_by):
+        """Возвращает одного пользователя по фильтрам или None."""
+        if filter_by.keys() == {"email"}:
+            return await self._fetch_one("by_email", b_email=filter_by["email"])
+        if filter_by.keys() == {"uuid"}:
+            return await self._fetch_one("by_uuid", b_uuid=filter_by["uuid"])
+        statement_stats.misses["get_one_or_none"] += 1
+        return await super().get_one_or_none(**filter_by)
+
+    async def edit(
+        self,
+        data: BaseModel,
+        exclude_unset: bool = False,
+        exlude_none: bool = False,
+        **filter_by,
+    ):
+        """Обновляет поля пользователя и возвращает идентификатор."""
+        values = data.model_dump(exclude_unset=exclude_unset, exclude_none=exlude_none)
+        if (
+            filter_by.keys() == {"email"}
+            and values.keys() <= set(PROFILE_FIELDS)
+            and None not in values.values()
+        ):
+            params = {f"b_{name}": values.get(name) for name in PROFILE_FIELDS}
+            user_id = await self._update_one(
+                "update_profile", values, b_email=filter_by["email"], **params
+            )
+            await self._reindex(user_id)
+            return user_id
+        statement_stats.misses["edit"] += 1
+        return await super().edit(
+            data, exclude_unset=exclude_unset, exlude_none=exlude_none, **filter_by
+        )
+
+    async def set_role(self, uuid: str, role: str) -> int:
+        """Меняет роль пользователя с указанным UUID и возвращает идентификатор."""
+        return await self._update_one(
+            "set_role", {"role": role}, b_uuid=uuid, b_role=role
+        )
+
+    async def set_password(self, email: str, password: str) -> int:
+        """Записывает хеш пароля пользователю с указанным email и возвращает идентификатор."""
+        return await self._update_one(
+            "set_password", {"password": password}, b_email=email, b_password=password
+        )
+
+    async def _reindex(self, user_id: int) -> None:
+        """Обновляет строку пользователя в полнотекстовом индексе."""
+        await self._execute("reindex_delete", b_id=user_id)
+        await self._execute("reindex_insert", b_id=user_id)
+
+    async def _execute(self, name: str, **params):
+        statement_stats.hits[name] += 1
+        return await self.session.execute(STATEMENTS[name], params)
+
+    async def _fetch_one(self, name: str, **params):
+        result = await self._execute(name, **params)
+        return result.scalars().one_or_none()
+
+    async def _update_one(self, name: str, values: dict, **params) -> int:
+        result = await self._execute(name, **params)
+        user_id = result.scalar_one()
+        user = self.session.identity_map.get(identity_key(User, user_id))
+        if user is not None:
+            for key, value in values.items():
+                set_committed_value(user, key, value)
+        return user_id
+
+
+statement_stats = StatementStats()
@@ -0,0 +1,35 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import ClassVar, Type
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.model_idempotency import IdempotencyRecord
+from src.infra.repositories.base import BaseRepository
+
+
+@dataclass
+class IdempotencyRepository(BaseRepository):
+    """Репозиторий для модели `IdempotencyRecord`."""
+
+    model: ClassVar[Type[IdempotencyRecord]] = IdempotencyRecord
+    session: AsyncSession
+
+    async def get_one_or_none(self, **filter_by):
+        """Возвращает сохранённый ответ по фильтрам или None."""
+        query = select(self.model).filter_by(**filter_by)
+        result = await self.session.execute(query)
+        return result.scalars().one_or_none()
+
+    async def add_many(self, rows: list[dict]) -> None:
+        """Сохраняет пачку ответов (executemany), заменяя записи с теми же ключами."""
+        if rows:
+            await self.session.execute(
+                insert(self.model).prefix_with("OR REPLACE"), rows
+            )
+
+    async def delete_expired(self, now: datetime) -> int:
+        """Удаляет просроченные ответы и возвращает их количество."""
+        stmt = delete(self.model).where(self.model.expires_at <= now)
+        res = await self.session.execute(stmt)
+        return res.rowcount
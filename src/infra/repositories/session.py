@@ -0,0 +1,84 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import ClassVar, Type
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.model_session import UserSession
+from src.infra.repositories.base import BaseRepository
+
+
+@dataclass
+class SessionRepository(BaseRepository):
+    """Репозиторий для модели `UserSession`."""
+
+    model: ClassVar[Type[UserSession]] = UserSession
+    session: AsyncSession
+
+    async def get_all(self):
+        """Возвращает список всех сессий."""
+        result = await self.session.execute(select(self.model))
+        return result.scalars().all()
+
+    async def get_one_or_none(self, **filter_by):
+        """Возвращает одну сессию по фильтрам или None."""
+        query = select(self.model).filter_by(**filter_by)
+        result = await self.session.execute(query)
+        return result.scalars().one_or_none()
+
+    async def get_many_by_hashes(self, token_hashes: list[str]):
+        """Возвращает сессии с указанными token_hash одним запросом `IN (...)`."""
+        if not token_hashes:
+            return []
+        query = select(self.model).where(self.model.token_hash.in_(token_hashes))
+        result = await self.session.execute(query)
+        return result.scalars().all()
+
+    async def get_for_user(self, user_uuid: str):
+        """Возвращает все сессии пользователя."""
+        query = (
+            select(self.model)
+            .filter_by(user_uuid=user_uuid)
+            .order_by(self.model.created_at)
+        )
+        result = await self.session.execute(query)
+        return result.scalars().all()
+
+    async def add(self, data: dict):
+        """Создаёт сессию и возвращает её идентификатор."""
+        stmt = insert(self.model).values(**data).returning(self.model.id)
+        res = await self.session.execute(stmt)
+        return res.scalar_one()
+
+    async def edit(self, data: dict, exclude_unset: bool = False, **filter_by):
+        """Обновляет сессии по фильтру и возвращает их token_hash."""
+        stmt = (
+            update(self.model)
+            .filter_by(**filter_by)
+            .values(**data)
+            .returning(self.model.token_hash)
+        )
+        res = await self.session.execute(stmt)
+        return res.scalars().all()
+
+    async def extend_many(self, token_hashes: list[str], expires_at: datetime) -> None:
+        """Продлевает сессии с указанными token_hash до `expires_at` одним UPDATE."""
+        if token_hashes:
+            stmt = (
+                update(self.model)
+                .where(self.model.token_hash.in_(token_hashes))
+                .values(expires_at=expires_at)
+            )
+            await self.session.execute(stmt)
+
+    async def delete(self, **filter_by):
+        """Удаляет сессии по фильтру и возвращает их token_hash."""
+        stmt = delete(self.model).filter_by(**filter_by).returning(self.model.token_hash)
+        res = await self.session.execute(stmt)
+        return res.scalars().all()
+
+    async def delete_expired(self, now: datetime) -> int:
+        """Удаляет истёкшие сессии и возвращает их количество."""
+        stmt = delete(self.model).where(self.model.expires_at <= now)
+        res = await self.session.execute(stmt)
+        return res.rowcount
@@ -0,0 +1,281 @@
+import asyncio
+import heapq
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Type
+
+from pydantic import BaseModel
+
+from src.config import settings
+from src.db.model_user import User
+from src.db.shards import shard_directory, user_shards
+from src.db.uow import UnitOfWork
+from src.db.user_search import INDEXED_FIELDS, bm25, search_terms
+from src.infra.repositories.compiled_user import CompiledUserRepository
+from src.infra.repositories.user import UserRepository
+
+
+@dataclass
+class SearchTotals:
+    """Число строк и токенов поискового индекса каждого шарда.
+
+    Подсчёт токенов проходит по всему словарю индекса, поэтому итоги шарда
+    кэшируются на `ttl` секунд: средняя длина строки меняется медленно,
+    и запаздывание почти не влияет на ранг.
+    """
+
+    ttl: float = settings.SEARCH_TOTALS_TTL_SECONDS
+
+    _totals: dict[int, tuple[float, tuple[int, int]]] = field(default_factory=dict)
+
+    async def get(self, n: int, repository: UserRepository) -> tuple[int, int]:
+        """Возвращает (строки, токены) шарда `n`, при необходимости пересчитывая."""
+        now = time.monotonic()
+        cached = self._totals.get(n)
+        if cached is not None and now - cached[0] < self.ttl:
+            return cached[1]
+        totals = await repository.search_totals()
+        self._totals[n] = (now, totals)
+        return totals
+
+
+@dataclass
+class ShardedUserRepository(UserRepository):
+    """Репозиторий пользователей, распределённых по шардам.
+
+    Операции с email направляются в шард по стабильному хешу email,
+    операции с UUID — через справочник `shard_directory`. Запросы без
+    ключа шардирования (списки, поиск, экспорт) выполняются на всех
+    шардах параллельно, а результаты сливаются в общем порядке.
+    `session` — сессия основной БД, в которой ведётся справочник.
+    """
+
+    uow: UnitOfWork = None
+
+    @classmethod
+    def from_uow(cls, uow: UnitOfWork) -> "ShardedUserRepository":
+        """Создаёт репозиторий, работающий в транзакции `uow`."""
+        return cls(session=uow.session, uow=uow)
+
+    def shard(self, n: int) -> UserRepository:
+        """Возвращает репозиторий одной БД поверх сессии шарда `n`."""
+        return get_single_repository_class()(session=self.uow.shard_session(n))
+
+    def _route(self, filter_by: dict) -> list[int]:
+        """Определяет шарды, в которых нужно выполнить запрос с фильтром."""
+        if "email" in filter_by:
+            return [user_shards.shard_for_email(filter_by["email"])]
+        if "uuid" in filter_by:
+            shard = shard_directory.get(filter_by["uuid"])
+            return [] if shard is None else [shard]
+        return list(range(user_shards.count))
+
+    async def _scatter(self, shards: list[int], method: str, *args, **kwargs) -> list:
+        return await asyncio.gather(
+            *(getattr(self.shard(n), method)(*args, **kwargs) for n in shards)
+        )
+
+    async def get_all(self):
+        """Возвращает список всех пользователей со всех шардов."""
+        results = await self._scatter(list(range(user_shards.count)), "get_all")
+        return [user for users in results for user in users]
+
+    async def get_one_or_none(self, **filter_by):
+        """Возвращает одного пользователя по фильтрам или None."""
+        found = [
+            user
+            for user in await self._scatter(
+                self._route(filter_by), "get_one_or_none", **filter_by
+            )
+            if user is not None
+        ]
+        if len(found) > 1:
+            raise ValueError("Найдено несколько пользователей")
+        return found[0] if found else None
+
+    async def get_many_by_emails(self, emails: list[str]):
+        """Возвращает пользователей по email: один запрос `IN (...)` на шард."""
+        by_shard: dict[int, list[str]] = {}
+        for email in emails:
+            by_shard.setdefault(user_shards.shard_for_email(email), []).append(email)
+        results = await asyncio.gather(
+            *(
+                self.shard(n).get_many_by_emails(shard_emails)
+                for n, shard_emails in by_shard.items()
+            )
+        )
+        return [user for users in results for user in users]
+
+    async def get_page_by_email(self, after: str | None = None, limit: int = 50):
+        """Возвращает страницу пользователей по email, слитую со всех шардов."""
+        results = await self._scatter(
+            list(range(user_shards.count)),
+            "get_page_by_email",
+            after=after,
+            limit=limit,
+        )
+        merged = heapq.merge(*results, key=lambda user: user.email)
+        return [user for _, user in zip(range(limit), merged)]
+
+    async def add(self, data: BaseModel, **values):
+        """Создаёт пользователя в его шарде и регистрирует его в справочнике."""
+        shard = user_shards.shard_for_email(data.email)
+        user_uuid = values.pop("uuid", None) or str(uuid.uuid4())
+        user_id = await self.shard(shard).add(data, uuid=user_uuid, **values)
+        await shard_directory.put(self.session, user_uuid, shard)
+        return user_id
+
+    async def edit(
+        self,
+        data: BaseModel,
+        exclude_unset: bool = False,
+        exlude_none: bool = False,
+        **filter_by,
+    ):
+        """Обновляет поля пользователя в его шарде и возвращает идентификатор."""
+        shards = self._route(filter_by)
+        if len(shards) != 1:
+            raise ValueError("Пользователь не найден")
+        return await self.shard(shards[0]).edit(
+            data, exclude_unset=exclude_unset, exlude_none=exlude_none, **filter_by
+        )
+
+    async def set_role(self, uuid: str, role: str) -> int:
+        """Меняет роль пользователя в его шарде и возвращает идентификатор."""
+        shards = self._route({"uuid": uuid})
+        if len(shards) != 1:
+            raise ValueError("Пользователь не найден")
+        return await self.shard(shards[0]).set_role(uuid, role)
+
+    async def set_password(self, email: str, password: str) -> int:
+        """Записывает хеш пароля пользователю в его шарде и возвращает идентификатор."""
+        return await self.shard(user_shards.shard_for_email(email)).set_password(
+            email, password
+        )
+
+    async def delete(self, **filter_by):
+        """Удаляет пользователя из его шарда и из справочника."""
+        for shard in self._route(filter_by):
+            repository = self.shard(shard)
+            existing = await repository.get_one_or_none(**filter_by)
+            if existing is not None:
+                user_id = await repository.delete(**filter_by)
+                await shard_directory.remove(self.session, existing.uuid)
+                return user_id
+        raise ValueError("Пользователь не найден")
+
+    async def search_ranked(
+        self, query: str, limit: int = 20, offset: int = 0
+    ) -> list[tuple[User, float]]:
+        """Ищет на всех шардах и упорядочивает результаты по общему рангу bm25.
+
+        bm25, посчитанный FTS5 в шарде, зависит от статистики только его
+        корпуса (число строк, средняя длина, частота терма), поэтому ранги
+        разных шардов несравнимы. Каждый шард отбирает `offset + limit`
+        кандидатов по своему рангу и возвращает статистику индекса (итоги –
+        из кэша `search_totals`); ранг кандидатов пересчитывается по
+        статистике, сложенной по всем шардам, — так же, как его посчитал бы
+        FTS5 на одной общей БД.
+        """
+        terms = search_terms(query)
+        if not terms:
+            return []
+        results = await asyncio.gather(
+            *(
+                self._search_shard(n, query, terms, offset + limit)
+                for n in range(user_shards.count)
+            )
+        )
+        rows = sum(totals[0] for _, totals, _ in results)
+        tokens = sum(totals[1] for _, totals, _ in results)
+        hits = [sum(counts) for counts in zip(*(hits for _, _, hits in results))]
+        ranked = sorted(
+            (
+                (
+                    user,
+                    bm25(
+                        [getattr(user, name) for name in INDEXED_FIELDS],
+                        terms,
+                        rows,
+                        tokens,
+                        hits,
+                    ),
+                )
+                for shard_rows, _, _ in results
+                for user, _ in shard_rows
+            ),
+            key=lambda row: row[1],
+        )
+        return ranked[offset : offset + limit]
+
+    async def _search_shard(self, n: int, query: str, terms: list[str], limit: int):
+        """Возвращает кандидатов шарда, итоги его индекса и частоты термов."""
+        repository = self.shard(n)
+        return (
+            await repository.search_ranked(query, limit, 0),
+            await search_totals.get(n, repository),
+            await repository.search_hits(terms),
+        )
+
+    async def apply_activity(self, rows: list[dict]) -> None:
+        """Применяет активность пользователей: один пакетный UPDATE на шард."""
+        by_shard: dict[int, list[dict]] = {}
+        for row in rows:
+            by_shard.setdefault(user_shards.shard_for_email(row["email"]), []).append(
+                row
+            )
+        await asyncio.gather(
+            *(
+                self.shard(n).apply_activity(shard_rows)
+                for n, shard_rows in by_shard.items()
+            )
+        )
+
+    async def count_deactivated(self, before: datetime) -> int:
+        """Возвращает число пользователей к очистке на всех шардах."""
+        counts = await self._scatter(
+            list(range(user_shards.count)), "count_deactivated", before
+        )
+        return sum(counts)
+
+    async def stamp_deactivated(self, now: datetime, limit: int) -> int:
+        """Проставляет `deactivated_at` в шардах по очереди, всего не больше `limit`."""
+        stamped = 0
+        for n in range(user_shards.count):
+            if stamped >= limit:
+                break
+            stamped += await self.shard(n).stamp_deactivated(now, limit - stamped)
+        return stamped
+
+    async def purge_deactivated(
+        self, before: datetime, limit: int
+    ) -> list[tuple[str, str]]:
+        """Очищает шарды по очереди (всего не больше `limit`) и удаляет пользователей из справочника."""
+        purged: list[tuple[str, str]] = []
+        for n in range(user_shards.count):
+            if len(purged) >= limit:
+                break
+            purged += await self.shard(n).purge_deactivated(before, limit - len(purged))
+        await shard_directory.remove_many(
+            self.session, [user_uuid for user_uuid, _ in purged]
+        )
+        return purged
+
+
+def get_single_repository_class() -> Type[UserRepository]:
+    """Возвращает класс репозитория пользователей одной БД (или одного шарда)."""
+    if settings.USER_REPOSITORY_MODE == "compiled":
+        return CompiledUserRepository
+    return UserRepository
+
+
+def get_user_repository_class() -> Type[UserRepository]:
+    """Возвращает класс репозитория пользователей для текущей конфигурации."""
+    return (
+        ShardedUserRepository if user_shards.enabled else get_single_repository_class()
+    )
+
+
+search_totals = SearchTotals()
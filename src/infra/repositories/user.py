@@ -1,10 +1,36 @@
 from dataclasses import dataclass
+from datetime import datetime
 from typing import ClassVar, Type
 from pydantic import BaseModel
-from sqlalchemy import delete, insert, select, update
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    Integer,
+    bindparam,
+    case,
+    delete,
+    false,
+    func,
+    insert,
+    literal,
+    literal_column,
+    select,
+    text,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.db.model_archive import ArchivedUser
 from src.db.model_user import User
+from src.db.uow import UnitOfWork
+from src.db.user_search import (
+    INDEXED_FIELDS,
+    USERS_FTS,
+    USERS_FTS_VOCAB,
+    match_expression,
+    search_terms,
+    users_fts,
+)
 from src.infra.repositories.base import BaseRepository
 
 
@@ -13,11 +39,18 @@ class UserRepository(BaseRepository):
     """Репозиторий для модели `User`.
 
     Содержит CRUD-методы, работающие через `AsyncSession` и SQLAlchemy Core.
+    Методы `add`/`edit`/`delete` поддерживают в актуальном состоянии
+    полнотекстовый индекс `users_fts`, по которому работает `search`.
     """
 
     model: ClassVar[Type[User]] = User
     session: AsyncSession
 
+    @classmethod
+    def from_uow(cls, uow: UnitOfWork) -> "UserRepository":
+        """Создаёт репозиторий, работающий в транзакции `uow`."""
+        return cls(session=uow.session)
+
     async def get_all(self):
         """Возвращает список всех пользователей."""
         query = select(self.model)
@@ -31,11 +64,37 @@ class UserRepository(BaseRepository):
         result = await self.session.execute(query)
         return result.scalars().one_or_none()
 
-    async def add(self, data: BaseModel):
-        """Создаёт пользователя и возвращает его идентификатор."""
-        stmt = insert(self.model).values(**data.model_dump()).returning(self.model.id)
+    async def get_many_by_emails(self, emails: list[str]):
+        """Возвращает пользователей с указанными email одним запросом `IN (...)`."""
+        if not emails:
+            return []
+        query = select(self.model).where(self.model.email.in_(emails))
+        result = await self.session.execute(query)
+        return result.scalars().all()
+
+    async def get_page_by_email(self, after: str | None = None, limit: int = 50):
+        """Возвращает до `limit` пользователей с email больше `after`, по возрастанию email."""
+        query = select(self.model)
+        if after is not None:
+            query = query.where(self.model.email > after)
+        query = query.order_by(self.model.email).limit(limit)
+        result = await self.session.execute(query)
+        return result.scalars().all()
+
+    async def add(self, data: BaseModel, **values):
+        """Создаёт пользователя и возвращает его идентификатор.
+
+        `values` дополняют поля схемы (например, заранее выбранный `uuid`).
+        """
+        stmt = (
+            insert(self.model)
+            .values(**data.model_dump(), **values)
+            .returning(self.model.id)
+        )
         res = await self.session.execute(stmt)
-        return res.scalar_one()
+        user_id = res.scalar_one()
+        await self._reindex(user_id)
+        return user_id
 
     async def edit(
         self,
@@ -54,10 +113,208 @@ class UserRepository(BaseRepository):
             .returning(self.model.id)
         )
         res = await self.session.execute(stmt)
+        user_id = res.scalar_one()
+        await self._reindex(user_id)
+        return user_id
+
+    async def set_role(self, uuid: str, role: str) -> int:
+        """Меняет роль пользователя с указанным UUID и возвращает идентификатор."""
+        stmt = (
+            update(self.model)
+            .where(self.model.uuid == uuid)
+            .values(role=role)
+            .returning(self.model.id)
+        )
+        res = await self.session.execute(stmt)
+        return res.scalar_one()
+
+    async def set_password(self, email: str, password: str) -> int:
+        """Записывает хеш пароля пользователю с указанным email и возвращает идентификатор."""
+        stmt = (
+            update(self.model)
+            .where(self.model.email == email)
+            .values(password=password)
+            .returning(self.model.id)
+        )
+        res = await self.session.execute(stmt)
         return res.scalar_one()
 
     async def delete(self, **filter_by):
         """Удаляет пользователя по фильтрам и возвращает идентификатор удалённой записи."""
         stmt = delete(self.model).filter_by(**filter_by).returning(self.model.id)
         res = await self.session.execute(stmt)
-        return res.scalar_one()
+        user_id = res.scalar_one()
+        await self.session.execute(
+            delete(users_fts).where(users_fts.c.rowid == user_id)
+        )
+        return user_id
+
+    async def search(self, query: str, limit: int = 20, offset: int = 0):
+        """Ищет пользователей по началу слов в ФИО и email.
+
+        Каждое слово запроса ищется как префикс (`"слово"*`), результаты
+        упорядочены по релевантности (bm25 FTS5).
+        """
+        return [user for user, _ in await self.search_ranked(query, limit, offset)]
+
+    async def search_ranked(
+        self, query: str, limit: int = 20, offset: int = 0
+    ) -> list[tuple[User, float]]:
+        """То же, что `search`, но вместе с рангом bm25 (меньше — релевантнее)."""
+        terms = search_terms(query)
+        if not terms:
+            return []
+        match = match_expression(terms)
+        rank = func.bm25(literal_column(users_fts.name))
+        stmt = (
+            select(self.model, rank)
+            .join(users_fts, users_fts.c.rowid == self.model.id)
+            .where(literal_column(users_fts.name).op("MATCH")(match))
+            .order_by(rank)
+            .limit(limit)
+            .offset(offset)
+        )
+        result = await self.session.execute(stmt)
+        return result.tuples().all()
+
+    async def search_totals(self) -> tuple[int, int]:
+        """Возвращает число строк и токенов в полнотекстовом индексе.
+
+        Токены суммируются по словарю индекса (`fts5vocab`), то есть запрос
+        проходит по всем его термам.
+        """
+        rows = await self.session.scalar(text(f"SELECT count(*) FROM {USERS_FTS}"))
+        tokens = await self.session.scalar(
+            text(f"SELECT coalesce(sum(cnt), 0) FROM {USERS_FTS_VOCAB}")
+        )
+        return rows, tokens
+
+    async def search_hits(self, terms: list[str]) -> list[int]:
+        """Возвращает число строк индекса, содержащих каждый из `terms`."""
+        hits = []
+        for term in terms:
+            stmt = (
+                select(func.count())
+                .select_from(users_fts)
+                .where(
+                    literal_column(users_fts.name).op("MATCH")(match_expression([term]))
+                )
+            )
+            hits.append(await self.session.scalar(stmt))
+        return hits
+
+    async def apply_activity(self, rows: list[dict]) -> None:
+        """Применяет накопленную активность пользователей одним executemany UPDATE.
+
+        Каждая строка: `email`, `last_login_at`, `last_seen_at` (None — не менять),
+        `reset_failed` (обнулить счётчик неудачных входов) и `failed`
+        (сколько неудачных входов добавить после обнуления).
+        """
+        if not rows:
+            return
+        table = self.model.__table__
+        stmt = (
+            update(table)
+            .where(table.c.email == bindparam("b_email"))
+            .values(
+                last_login_at=func.coalesce(
+                    bindparam("b_login", type_=DateTime), table.c.last_login_at
+                ),
+                last_seen_at=func.coalesce(
+                    bindparam("b_seen", type_=DateTime), table.c.last_seen_at
+                ),
+                failed_login_attempts=case(
+                    (bindparam("b_reset", type_=Boolean), 0),
+                    else_=table.c.failed_login_attempts,
+                )
+                + bindparam("b_failed", type_=Integer),
+            )
+        )
+        params = [
+            {
+                "b_email": row["email"],
+                "b_login": row["last_login_at"],
+                "b_seen": row["last_seen_at"],
+                "b_reset": row["reset_failed"],
+                "b_failed": row["failed"],
+            }
+            for row in rows
+        ]
+        connection = await self.session.connection()
+        await connection.execute(stmt, params)
+
+    async def count_deactivated(self, before: datetime) -> int:
+        """Возвращает число пользователей, деактивированных раньше `before`."""
+        query = select(func.count()).where(
+            self.model.is_active == false(), self.model.deactivated_at < before
+        )
+        result = await self.session.execute(query)
+        return result.scalar_one()
+
+    async def stamp_deactivated(self, now: datetime, limit: int) -> int:
+        """Проставляет `deactivated_at` до `limit` деактивированным без этой отметки.
+
+        Нужно для записей, деактивированных до появления поля: срок хранения
+        для них отсчитывается с момента отметки. Возвращает число обновлённых строк.
+        """
+        ids = (
+            select(self.model.id)
+            .where(self.model.is_active == false(), self.model.deactivated_at.is_(None))
+            .limit(limit)
+        )
+        stmt = (
+            update(self.model)
+            .where(self.model.id.in_(ids.scalar_subquery()))
+            .values(deactivated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        res = await self.session.execute(stmt)
+        return res.rowcount
+
+    async def purge_deactivated(
+        self, before: datetime, limit: int
+    ) -> list[tuple[str, str]]:
+        """Переносит в архив и удаляет до `limit` пользователей, деактивированных раньше `before`.
+
+        Возвращает пары (uuid, email) удалённых пользователей.
+        """
+        query = (
+            select(self.model.id, self.model.uuid, self.model.email)
+            .where(self.model.is_active == false(), self.model.deactivated_at < before)
+            .order_by(self.model.deactivated_at)
+            .limit(limit)
+        )
+        rows = (await self.session.execute(query)).all()
+        if not rows:
+            return []
+        ids = [row.id for row in rows]
+        fields = ("uuid", "email", "name", "last_name", "surname", "role")
+        source = select(
+            *(getattr(self.model, name) for name in fields),
+            self.model.deactivated_at,
+            literal(datetime.now(), DateTime).label("archived_at"),
+        ).where(self.model.id.in_(ids))
+        await self.session.execute(
+            insert(ArchivedUser).from_select(
+                [*fields, "deactivated_at", "archived_at"], source
+            )
+        )
+        await self.session.execute(delete(users_fts).where(users_fts.c.rowid.in_(ids)))
+        await self.session.execute(
+            delete(self.model)
+            .where(self.model.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        return [(row.uuid, row.email) for row in rows]
+
+    async def _reindex(self, user_id: int) -> None:
+        """Обновляет строку пользователя в полнотекстовом индексе."""
+        await self.session.execute(
+            delete(users_fts).where(users_fts.c.rowid == user_id)
+        )
+        source = select(
+            self.model.id, *(getattr(self.model, name) for name in INDEXED_FIELDS)
+        ).where(self.model.id == user_id)
+        await self.session.execute(
+            insert(users_fts).from_select(["rowid", *INDEXED_FIELDS], source)
+        )
@@ -0,0 +1,185 @@
+"""Сравнение обычного и заранее собранного репозитория пользователей.
+
+    python -m src.query_benchmark [--users 1000] [--queries 5000] [--rounds 5]
+
+На временной БД с `--users` пользователями выполняет по `--queries` вызовов
+каждой операции (by_email, by_uuid, update_profile, set_role, set_password)
+через `UserRepository` и `CompiledUserRepository` и печатает медиану среднего
+времени вызова по `--rounds` раундам. Порядок режимов в раундах чередуется,
+каждое измерение идёт в новой сессии, а первые `WARMUP_CALLS` вызовов
+не учитываются, так что ни один режим не получает преимущества прогретой БД.
+
+Время вызова раскладывается на две части: `build` – построение запроса
+и вычисление его ключа кэша компиляции (накладные расходы Python, которые
+убирает режим `compiled`), `execute` – выполнение уже собранного запроса
+(`session.execute` готового запроса из `STATEMENTS`).
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.api.schemas.edit_profile import UserUpdateSchema
+from src.db.model_user import Base, User
+from src.db.roles import UserRole
+from src.db.user_search import create_user_search_index
+from src.infra.repositories.compiled_user import STATEMENTS, CompiledUserRepository
+from src.infra.repositories.user import UserRepository
+
+WARMUP_CALLS = 200
+
+
+def _operations(users: list[tuple[str, str]]) -> dict:
+    """Возвращает операции: (вызов репозитория, построение запроса обычным
+    режимом, параметры готового запроса из `STATEMENTS`)."""
+    roles = (UserRole.ADMIN, UserRole.SIMPLE_USER)
+    profile = UserUpdateSchema(name="Пётр")
+
+    def pick(i: int) -> tuple[str, str]:
+        return users[i % len(users)]
+
+    return {
+        "by_email": (
+            lambda repo, i: repo.get_one_or_none(email=pick(i)[1]),
+            lambda i: select(User).filter_by(email=pick(i)[1]),
+            lambda i: {"b_email": pick(i)[1]},
+        ),
+        "by_uuid": (
+            lambda repo, i: repo.get_one_or_none(uuid=pick(i)[0]),
+            lambda i: select(User).filter_by(uuid=pick(i)[0]),
+            lambda i: {"b_uuid": pick(i)[0]},
+        ),
+        "update_profile": (
+            lambda repo, i: repo.edit(profile, exlude_none=True, email=pick(i)[1]),
+            lambda i: update(User)
+            .filter_by(email=pick(i)[1])
+            .values(**profile.model_dump(exclude_none=True))
+            .returning(User.id),
+            lambda i: {
+                "b_email": pick(i)[1],
+                "b_name": profile.name,
+                "b_last_name": None,
+                "b_surname": None,
+            },
+        ),
+        "set_role": (
+            lambda repo, i: repo.set_role(pick(i)[0], roles[i % 2]),
+            lambda i: update(User)
+            .where(User.uuid == pick(i)[0])
+            .values(role=roles[i % 2])
+            .returning(User.id),
+            lambda i: {"b_uuid": pick(i)[0], "b_role": roles[i % 2]},
+        ),
+        "set_password": (
+            lambda repo, i: repo.set_password(pick(i)[1], f"hash-{i}"),
+            lambda i: update(User)
+            .where(User.email == pick(i)[1])
+            .values(password=f"hash-{i}")
+            .returning(User.id),
+            lambda i: {"b_email": pick(i)[1], "b_password": f"hash-{i}"},
+        ),
+    }
+
+
+async def _time_calls(session_factory, call, queries: int) -> float:
+    """Возвращает среднее время вызова `call(session, i)` в микросекундах.
+
+    Вызовы идут в новой сессии; первые `WARMUP_CALLS` не учитываются.
+    """
+    async with session_factory() as session:
+        for i in range(WARMUP_CALLS):
+            await call(session, i)
+        started = time.perf_counter()
+        for i in range(queries):
+            await call(session, i)
+        elapsed = time.perf_counter() - started
+        await session.rollback()
+    return elapsed / queries * 1e6
+
+
+def _time_build(build, queries: int) -> float:
+    """Возвращает среднее время построения запроса и его ключа кэша в микросекундах."""
+    for i in range(WARMUP_CALLS):
+        build(i)._generate_cache_key()
+    started = time.perf_counter()
+    for i in range(queries):
+        build(i)._generate_cache_key()
+    return (time.perf_counter() - started) / queries * 1e6
+
+
+async def _measure(
+    session_factory, name: str, operation: tuple, queries: int, rounds: int
+) -> dict[str, float]:
+    """Измеряет операцию в `rounds` раундах и возвращает медианы по режимам."""
+    call, build, params = operation
+    modes = {
+        "dynamic": lambda session, i: call(UserRepository(session=session), i),
+        "compiled": lambda session, i: call(CompiledUserRepository(session=session), i),
+        "execute": lambda session, i: session.execute(STATEMENTS[name], params(i)),
+    }
+    samples: dict[str, list[float]] = {mode: [] for mode in modes}
+    order = list(modes)
+    for _ in range(rounds):
+        for mode in order:
+            samples[mode].append(
+                await _time_calls(session_factory, modes[mode], queries)
+            )
+        order.reverse()
+    result = {mode: statistics.median(values) for mode, values in samples.items()}
+    result["build"] = statistics.median(
+        _time_build(build, queries) for _ in range(rounds)
+    )
+    return result
+
+
+async def run(users: int, queries: int, rounds: int) -> None:
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{workdir}/benchmark.db")
+        session_factory = async_sessionmaker(
+            engine, expire_on_commit=False, class_=AsyncSession
+        )
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(create_user_search_index)
+            rows = [
+                {
+                    "uuid": f"00000000-0000-0000-0000-{n:012d}",
+                    "name": "Иван",
+                    "last_name": "Иванов",
+                    "surname": "Иванович",
+                    "email": f"user{n}@example.com",
+                    "password": "hash",
+                }
+                for n in range(users)
+            ]
+            await conn.execute(insert(User), rows)
+        pairs = [(row["uuid"], row["email"]) for row in rows]
+
+        print(
+            f"{'operation':>14}  {'dynamic':>9}  {'compiled':>9}  {'saved':>8}  "
+            f"{'build':>8}  {'execute':>8}   (µs per call, median of {rounds})"
+        )
+        for name, operation in _operations(pairs).items():
+            result = await _measure(session_factory, name, operation, queries, rounds)
+            print(
+                f"{name:>14}  {result['dynamic']:9.1f}  {result['compiled']:9.1f}  "
+                f"{result['dynamic'] - result['compiled']:8.1f}  "
+                f"{result['build']:8.1f}  {result['execute']:8.1f}"
+            )
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Сравнение обычного и заранее собранного репозитория пользователей"
+    )
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.users, args.queries, args.rounds))
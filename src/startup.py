@@ -0,0 +1,50 @@
+import asyncio
+import logging
+
+from src.auth.jwt import warm_password_context
+from src.auth.sessions import session_store
+from src.config import settings
+from src.db.engine import async_run_db, sync_search_indexes, warm_pool
+from src.db.seed import seed_catalog
+
+logger = logging.getLogger(__name__)
+
+
+async def prepare() -> asyncio.Task | None:
+    """Готовит БД и криптографию к приёму запросов.
+
+    В режиме `STARTUP_MODE=fast` до приёма запросов создаётся схема БД
+    параллельно с прогревом пула соединений и bcrypt (в отдельном потоке),
+    чтобы первый вход не платил за загрузку бэкенда. Необязательная для
+    обслуживания работа – демо-каталог, очистка истёкших сессий, дозаполнение
+    поисковых индексов – выполняется фоновой задачей, которую функция
+    и возвращает. В режиме `eager` всё выполняется последовательно до начала
+    приёма запросов.
+    """
+    if settings.STARTUP_MODE == "eager":
+        await async_run_db()
+        warm_password_context()
+        await maintenance()
+        return None
+
+    await asyncio.gather(
+        async_run_db(sync_search_index=False),
+        warm_pool(),
+        asyncio.to_thread(warm_password_context),
+    )
+    return asyncio.create_task(_background_maintenance())
+
+
+async def maintenance() -> None:
+    """Стартовое обслуживание: демо-каталог, истёкшие сессии, поисковые индексы."""
+    await seed_catalog()
+    if settings.AUTH_MODE == "session":
+        await session_store.purge_expired()
+    await sync_search_indexes()
+
+
+async def _background_maintenance() -> None:
+    try:
+        await maintenance()
+    except Exception:
+        logger.exception("Ошибка фонового обслуживания при старте")
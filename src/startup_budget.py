@@ -0,0 +1,130 @@
+"""Проверка бюджета холодного старта.
+
+    python -m src.startup_budget [--runs 3]
+
+Несколько раз запускает сервис в отдельном процессе на чистой временной БД
+и измеряет время импорта приложения и время до первого ответа (импорт,
+создание приложения, lifespan и запрос `GET /api/v1/health/live`). Лучшие
+значения сравниваются с `STARTUP_IMPORT_BUDGET_MS` и `STARTUP_FIRST_REQUEST_BUDGET_MS`;
+при превышении команда завершается с кодом 1, поэтому её можно запускать в CI.
+
+Модуль на верхнем уровне импортирует только стандартную библиотеку, чтобы
+не искажать измерение.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+async def _first_request(app, path: str) -> int:
+    """Выполняет GET-запрос к ASGI-приложению и возвращает статус ответа."""
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 0),
+        "server": ("localhost", 80),
+    }
+    await app(scope, receive, send)
+    return status
+
+
+def _measure() -> dict:
+    """Измеряет старт в текущем (свежем) процессе."""
+    started = time.perf_counter()
+    import main
+
+    imported = time.perf_counter()
+    app = main.create()
+
+    async def serve_first_request() -> tuple[int, float]:
+        async with app.router.lifespan_context(app):
+            status = await _first_request(app, "/api/v1/health/live")
+            answered = time.perf_counter()
+        return status, answered
+
+    status, answered = asyncio.run(serve_first_request())
+    return {
+        "import_ms": (imported - started) * 1000,
+        "first_request_ms": (answered - started) * 1000,
+        "status": status,
+    }
+
+
+def _run_once() -> dict:
+    with tempfile.TemporaryDirectory() as workdir:
+        env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite+aiosqlite:///{workdir}/startup.db",
+            "USER_SHARD_URL": f"sqlite+aiosqlite:///{workdir}/users_shard_{{n}}.db",
+        }
+        result = subprocess.run(
+            [sys.executable, "-m", "src.startup_budget", "--measure"],
+            cwd=BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def check(runs: int) -> bool:
+    """Проверяет бюджеты и печатает отчёт; возвращает True, если они соблюдены."""
+    from src.config import settings
+
+    results = [_run_once() for _ in range(runs)]
+    import_ms = min(result["import_ms"] for result in results)
+    first_request_ms = min(result["first_request_ms"] for result in results)
+    ok = True
+    for name, value, budget in (
+        ("import", import_ms, settings.STARTUP_IMPORT_BUDGET_MS),
+        ("first request", first_request_ms, settings.STARTUP_FIRST_REQUEST_BUDGET_MS),
+    ):
+        passed = value <= budget
+        ok = ok and passed
+        print(
+            f"{name:>13}: {value:7.1f} ms  (budget {budget} ms)  "
+            f"{'OK' if passed else 'EXCEEDED'}"
+        )
+    if any(result["status"] != 200 for result in results):
+        print("first request did not return 200")
+        ok = False
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Проверка бюджета холодного старта")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--measure", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.measure:
+        print(json.dumps(_measure()))
+    else:
+        sys.exit(0 if check(args.runs) else 1)
@@ -0,0 +1,10 @@
+import atexit
+import os
+import shutil
+import tempfile
+
+# Настройки без значений по умолчанию и отдельная БД для тестов.
+_workdir = tempfile.mkdtemp(prefix="authservice-tests-")
+atexit.register(shutil.rmtree, _workdir, ignore_errors=True)
+os.environ.setdefault("JWT_SECRET_KEY", "test")
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{_workdir}/test.db")
@@ -0,0 +1,52 @@
+import unittest
+
+from sqlalchemy import event, func, select
+
+from src.db.engine import async_run_db, engine, get_async_session
+from src.db.model_audit import AuditAction, AuditRecord
+from src.infra.audit import AuditLog
+
+BATCH_SIZE = 500
+
+
+class AuditLogTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        await async_run_db()
+        self.inserts: list[tuple[str, bool]] = []
+        event.listen(engine.sync_engine, "before_cursor_execute", self._capture)
+
+    async def asyncTearDown(self):
+        event.remove(engine.sync_engine, "before_cursor_execute", self._capture)
+        await engine.dispose()
+
+    def _capture(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith(f"INSERT INTO {AuditRecord.__tablename__}"):
+            self.inserts.append((statement, executemany))
+
+    async def _count(self, email: str) -> int:
+        async with get_async_session() as session:
+            return await session.scalar(
+                select(func.count())
+                .select_from(AuditRecord)
+                .where(AuditRecord.email == email)
+            )
+
+    async def test_flushes_batch_without_growing_bind_parameters(self):
+        audit = AuditLog(batch_size=BATCH_SIZE)
+        for n in range(BATCH_SIZE):
+            audit.emit(next(iter(AuditAction)), "batch@example.com", details=str(n))
+
+        self.assertTrue(await audit.flush())
+        self.assertEqual(audit.stats.batches, 1)
+        self.assertEqual(audit.stats.written, BATCH_SIZE)
+        self.assertEqual(await self._count("batch@example.com"), BATCH_SIZE)
+
+        # Одна строка параметров на запрос (executemany), а не пачка × колонки
+        # в одном многострочном INSERT, который упирается в лимит SQLite.
+        [(statement, executemany)] = self.inserts
+        self.assertTrue(executemany)
+        self.assertLess(statement.count("?"), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import hashlib
+import io
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.auth.breached import BreachedPasswords, build_index
+from src.db.engine import async_run_db, engine
+from src.infra.health import ReadinessProbe
+
+
+def _dump(*passwords: str) -> bytes:
+    return b"".join(
+        hashlib.sha1(password.encode()).hexdigest().upper().encode() + b":1\n"
+        for password in passwords
+    )
+
+
+class BreachedPasswordsTest(unittest.TestCase):
+    def setUp(self):
+        workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(workdir.cleanup)
+        self.index = Path(workdir.name) / "breached.idx"
+
+    def test_finds_passwords_from_dump(self):
+        build_index(io.BytesIO(_dump("password", "qwerty")), self.index, run_size=1)
+        passwords = BreachedPasswords(str(self.index))
+        self.addCleanup(passwords.close)
+
+        self.assertTrue(passwords.is_breached("qwerty"))
+        self.assertFalse(passwords.is_breached("Str0ng#Unique"))
+
+    def test_rejects_malformed_digest_with_line_number(self):
+        dump = _dump("password") + b"abcdef:3\n"
+        with self.assertRaisesRegex(ValueError, "Строка 2"):
+            build_index(io.BytesIO(dump), self.index)
+
+    def test_corrupted_index_disables_check_without_failing(self):
+        build_index(io.BytesIO(_dump("password")), self.index)
+        self.index.write_bytes(self.index.read_bytes()[:-1])
+        passwords = BreachedPasswords(str(self.index))
+
+        with self.assertLogs("src.auth.breached", level="ERROR"):
+            passwords.load()
+        self.assertFalse(passwords.available)
+        self.assertFalse(passwords.is_breached("password"))
+
+    def test_missing_index_disables_check_without_failing(self):
+        passwords = BreachedPasswords(str(self.index), required=False)
+
+        with self.assertLogs("src.auth.breached", level="ERROR"):
+            passwords.load()
+        self.assertFalse(passwords.available)
+        self.assertIn(str(self.index), passwords.error)
+        self.assertFalse(passwords.is_breached("password"))
+
+    def test_missing_required_index_fails_startup(self):
+        passwords = BreachedPasswords(str(self.index), required=True)
+
+        with self.assertRaises(FileNotFoundError):
+            passwords.load()
+
+
+class ReadinessTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncTearDown(self):
+        await engine.dispose()
+
+    async def test_disabled_check_is_reported_as_degraded(self):
+        await async_run_db()
+        passwords = BreachedPasswords("/nonexistent/breached.idx", required=False)
+        with self.assertLogs("src.auth.breached", level="ERROR"):
+            passwords.load()
+
+        with patch("src.infra.health.breached_passwords", passwords):
+            ready, checks, errors = await ReadinessProbe().check()
+
+        self.assertTrue(ready)
+        self.assertFalse(checks["breached_passwords"])
+        self.assertTrue(any("утёкших паролей" in error for error in errors))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import asyncio
+import unittest
+
+from starlette.requests import Request
+
+from src.api.services.catalog_cache import CatalogCache
+
+
+def _request() -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": []})
+
+
+class CatalogCacheTest(unittest.IsolatedAsyncioTestCase):
+    async def test_load_racing_with_invalidate_is_not_cached(self):
+        cache = CatalogCache()
+        loads = []
+
+        async def loader():
+            loads.append(len(loads))
+            if len(loads) == 1:
+                # Запись (например, заполнение демо-каталога) коммитится,
+                # пока первый запрос ещё читает данные.
+                await asyncio.sleep(0)
+                cache.invalidate("products")
+                return []
+            return [{"id": 1}]
+
+        first = await cache.respond(_request(), "products", loader)
+        second = await cache.respond(_request(), "products", loader)
+
+        self.assertEqual(first.body, b"[]")
+        self.assertEqual(second.body, b'[{"id":1}]')
+        self.assertNotEqual(first.headers["etag"], second.headers["etag"])
+
+    async def test_unchanged_resource_is_served_from_cache(self):
+        cache = CatalogCache()
+        loads = []
+
+        async def loader():
+            loads.append(None)
+            return [{"id": 1}]
+
+        first = await cache.respond(_request(), "products", loader)
+        second = await cache.respond(_request(), "products", loader)
+
+        self.assertEqual(len(loads), 1)
+        self.assertEqual(first.headers["etag"], second.headers["etag"])
+
+
+if __name__ == "__main__":
+    unittest.main()
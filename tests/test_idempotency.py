@@ -0,0 +1,112 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+
+from fastapi.routing import APIRoute
+
+from src.api.middleware.idempotency import IdempotencyMiddleware
+from src.db.engine import async_run_db, engine
+from src.infra.idempotency import IdempotencyStore
+
+PATH = "/api/v1/users/"
+LOOKUP_DELAY = 0.05
+
+
+class SlowLookupStore(IdempotencyStore):
+    """Хранилище с медленным `lookup` (запрос к БД под нагрузкой)."""
+
+    async def lookup(self, key):
+        stored = await super().lookup(key)
+        await asyncio.sleep(LOOKUP_DELAY)
+        return stored
+
+
+class IdempotencyMiddlewareTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        await async_run_db()
+
+    async def asyncTearDown(self):
+        await engine.dispose()
+
+    def setUp(self):
+        self.calls = 0
+        self.store = SlowLookupStore()
+        self.middleware = IdempotencyMiddleware(self.handler, store=self.store)
+        route = APIRoute(PATH, lambda: None, methods=["POST"])
+        self.app = SimpleNamespace(
+            state=SimpleNamespace(idempotent_routes=[("POST", route)])
+        )
+
+    async def handler(self, scope, receive, send):
+        self.calls += 1
+        await receive()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 201,
+                "headers": [(b"content-type", b"application/json")],
+            }
+        )
+        await send({"type": "http.response.body", "body": b'{"id": 1}'})
+
+    async def request(self, body: bytes = b"{}", key: str = "key-1") -> dict:
+        scope = {
+            "type": "http",
+            "method": "POST",
+            "path": PATH,
+            "root_path": "",
+            "query_string": b"",
+            "headers": [(b"idempotency-key", key.encode())],
+            "app": self.app,
+        }
+        messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+        async def receive():
+            return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+        response = {"headers": {}, "body": b""}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = dict(message["headers"])
+            else:
+                response["body"] += message.get("body", b"")
+
+        await self.middleware(scope, receive, send)
+        return response
+
+    async def test_replays_stored_response(self):
+        first = await self.request()
+        second = await self.request()
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(second["status"], first["status"])
+        self.assertEqual(second["body"], first["body"])
+        self.assertEqual(second["headers"].get(b"idempotency-replayed"), b"true")
+
+    async def test_duplicate_during_lookup_waits_for_first_request(self):
+        # Повтор приходит, пока первый запрос ещё ждёт `lookup`, а завершается
+        # после того, как первый уже выполнен и снял отметку о выполнении.
+        first = asyncio.create_task(self.request())
+        await asyncio.sleep(LOOKUP_DELAY / 5)
+        second = asyncio.create_task(self.request())
+        first, second = await asyncio.gather(first, second)
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(second["status"], 201)
+        self.assertEqual(second["body"], first["body"])
+        self.assertEqual(second["headers"].get(b"idempotency-replayed"), b"true")
+
+    async def test_concurrent_duplicate_with_other_body_is_rejected(self):
+        first = asyncio.create_task(self.request(b'{"a": 1}'))
+        await asyncio.sleep(LOOKUP_DELAY / 5)
+        second = await self.request(b'{"a": 2}')
+        await first
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(second["status"], 422)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+from src.db.engine import async_run_db, engine
+from src.infra.idempotency import IdempotencyStore
+
+HEADERS = [(b"content-type", b"application/json")]
+
+
+class IdempotencyStoreTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        await async_run_db()
+
+    async def asyncTearDown(self):
+        await engine.dispose()
+
+    async def test_sees_responses_spilled_by_another_process(self):
+        # Второй процесс стартовал, когда сохранённых ответов в БД ещё не было.
+        other = IdempotencyStore()
+        await other.load()
+
+        store = IdempotencyStore(max_size=1)
+        await store.save("spilled", "fp", 201, HEADERS, b"{}")
+        await store.save("in-memory", "fp", 201, HEADERS, b"{}")
+
+        stored = await other.lookup("spilled")
+        self.assertIsNotNone(stored)
+        self.assertEqual(stored.status_code, 201)
+        self.assertEqual(stored.headers, HEADERS)
+        self.assertIsNone(await other.lookup("in-memory"))
+
+    async def test_stop_spills_all_responses(self):
+        store = IdempotencyStore()
+        for n in range(300):
+            await store.save(f"key-{n}", "fp", 200, HEADERS, b"{}")
+        await store.stop()
+
+        restarted = IdempotencyStore()
+        await restarted.load()
+        self.assertIsNotNone(await restarted.lookup("key-0"))
+        self.assertIsNotNone(await restarted.lookup("key-299"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+import uuid
+from pathlib import Path
+
+from sqlalchemy import create_engine, func, insert, select
+
+from src.db.model_shard import ShardDirectoryEntry
+from src.db.model_user import User
+from src.db.shards import shard_for_email
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+USERS = 50
+
+
+class RebalanceTest(unittest.TestCase):
+    """Запускает `python -m src.db.rebalance` на временных БД."""
+
+    def setUp(self):
+        workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(workdir.cleanup)
+        self.workdir = Path(workdir.name)
+        self.rows = [
+            {
+                "uuid": str(uuid.uuid4()),
+                "name": "Иван",
+                "last_name": "Иванов",
+                "surname": "Иванович",
+                "email": f"user{n}@example.com",
+                "password": "hash",
+            }
+            for n in range(USERS)
+        ]
+        self._insert(self._main(), self.rows)
+
+    def _main(self) -> Path:
+        return self.workdir / "main.db"
+
+    def _shard(self, n: int) -> Path:
+        return self.workdir / f"users_shard_{n}.db"
+
+    def _insert(self, path: Path, rows: list[dict]) -> None:
+        engine = create_engine(f"sqlite:///{path}")
+        with engine.begin() as conn:
+            User.metadata.create_all(conn, tables=[User.__table__])
+            conn.execute(insert(User), rows)
+        engine.dispose()
+
+    def _scalars(self, path: Path, stmt) -> list:
+        engine = create_engine(f"sqlite:///{path}")
+        with engine.connect() as conn:
+            result = conn.execute(stmt).scalars().all()
+        engine.dispose()
+        return result
+
+    def _emails(self, path: Path) -> list[str]:
+        if not path.exists():
+            return []
+        return self._scalars(path, select(User.email))
+
+    def _rebalance(self, from_shards: int, to_shards: int) -> None:
+        env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite+aiosqlite:///{self._main()}",
+            "USER_SHARD_URL": f"sqlite+aiosqlite:///{self.workdir}/users_shard_{{n}}.db",
+        }
+        subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "src.db.rebalance",
+                "--from-shards",
+                str(from_shards),
+                "--to-shards",
+                str(to_shards),
+            ],
+            cwd=BASE_DIR,
+            env=env,
+            capture_output=True,
+            check=True,
+        )
+
+    def _assert_split(self) -> None:
+        self.assertEqual(self._emails(self._main()), [])
+        for n in range(2):
+            expected = sorted(
+                row["email"]
+                for row in self.rows
+                if shard_for_email(row["email"], 2) == n
+            )
+            self.assertEqual(sorted(self._emails(self._shard(n))), expected)
+        directory = self._scalars(
+            self._main(), select(func.count()).select_from(ShardDirectoryEntry)
+        )
+        self.assertEqual(directory, [USERS])
+
+    def test_interrupted_run_is_resumed_by_rerun(self):
+        # Прерванный запуск: часть пользователей уже скопирована в новый
+        # шард, но ещё не удалена из старого.
+        copied = self.rows[:10]
+        for n in range(2):
+            self._insert(
+                self._shard(n),
+                [row for row in copied if shard_for_email(row["email"], 2) == n],
+            )
+
+        self._rebalance(1, 2)
+        self._assert_split()
+
+        self._rebalance(1, 2)
+        self._assert_split()
+
+    def test_round_trip(self):
+        self._rebalance(1, 2)
+        self._assert_split()
+
+        self._rebalance(2, 1)
+        self.assertEqual(
+            sorted(self._emails(self._main())),
+            sorted(row["email"] for row in self.rows),
+        )
+        for n in range(2):
+            self.assertEqual(self._emails(self._shard(n)), [])
+        directory = self._scalars(
+            self._main(), select(func.count()).select_from(ShardDirectoryEntry)
+        )
+        self.assertEqual(directory, [0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,22 @@
+import contextlib
+import io
+import os
+import unittest
+
+from src import startup_budget
+
+
+@unittest.skipUnless(
+    os.environ.get("STARTUP_BUDGET_TEST") == "1",
+    "замер времени старта включается STARTUP_BUDGET_TEST=1",
+)
+class StartupBudgetTest(unittest.TestCase):
+    def test_cold_start_fits_budget(self):
+        report = io.StringIO()
+        with contextlib.redirect_stdout(report):
+            ok = startup_budget.check(runs=1)
+        self.assertTrue(ok, report.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+
+from sqlalchemy import create_engine, insert, select, text
+
+from src.db.user_search import (
+    INDEXED_FIELDS,
+    USERS_FTS,
+    USERS_FTS_VOCAB,
+    bm25,
+    create_user_search_index,
+    match_expression,
+    users_fts,
+)
+
+ROWS = [
+    ("Иван", "Иванов", "Иванович", "ivan@example.com"),
+    ("Пётр", "Петров", "Иванович", "petr.petrov@example.com"),
+    ("Йосиф", "Иванов", "", "iosif@example.com"),
+    ("José", "Ivanov", "Ivan", "jose_ivanov@example.com"),
+    ("Анна", "Иванова", "Петровна", "anna@example.com"),
+]
+
+
+class Bm25Test(unittest.TestCase):
+    def test_matches_fts5_bm25(self):
+        engine = create_engine("sqlite://")
+        self.addCleanup(engine.dispose)
+        with engine.begin() as conn:
+            create_user_search_index(conn, sync=False)
+            conn.execute(
+                insert(users_fts),
+                [dict(zip(INDEXED_FIELDS, row)) for row in ROWS],
+            )
+            rows = conn.scalar(text(f"SELECT count(*) FROM {USERS_FTS}"))
+            tokens = conn.scalar(text(f"SELECT sum(cnt) FROM {USERS_FTS_VOCAB}"))
+            for terms in (
+                ["иван"],
+                ["ив", "петр"],
+                ["jose"],
+                ["йосиф"],
+                ["пётр"],
+                ["jos"],
+                ["example"],
+            ):
+                hits = [
+                    conn.scalar(
+                        text(
+                            f"SELECT count(*) FROM {USERS_FTS} WHERE {USERS_FTS} MATCH :q"
+                        ),
+                        {"q": match_expression([term])},
+                    )
+                    for term in terms
+                ]
+                matched = conn.execute(
+                    select(
+                        *(users_fts.c[name] for name in INDEXED_FIELDS),
+                        text("bm25(users_fts)"),
+                    )
+                    .where(text(f"{USERS_FTS} MATCH :q"))
+                    .params(q=match_expression(terms))
+                ).all()
+                self.assertTrue(matched, terms)
+                for *values, expected in matched:
+                    self.assertAlmostEqual(
+                        bm25(values, terms, rows, tokens, hits), expected, places=9
+                    )
+
+
+if __name__ == "__main__":
+    unittest.main()